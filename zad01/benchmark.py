@@ -0,0 +1,78 @@
+"""
+Porównanie reprezentacji macierzy sąsiedztwa: gęstej (MacierzGesta) i rzadkiej (MacierzRzadka).
+
+Dla każdego rozmiaru generowany jest losowy multigraf nieskierowany o zadanym średnim stopniu,
+a następnie na obu reprezentacjach mierzony jest czas dodawania krawędzi, zapytań o stopnie,
+usuwania krawędzi oraz szczytowe zużycie pamięci.
+
+Uruchomienie:
+python benchmark.py                 -> domyślne rozmiary
+python benchmark.py 1000 5000 20000 -> własne rozmiary (liczba wierzchołków)
+"""
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+from macierze import REPREZENTACJE
+
+SREDNI_STOPIEN = 8
+
+
+def losowe_krawedzie(n, sredni_stopien, seed=0):
+    rng = np.random.default_rng(seed)
+    m = n * sredni_stopien // 2
+    u = rng.integers(0, n, m)
+    v = rng.integers(0, n, m)
+    petle = u == v
+    v[petle] = (v[petle] + 1) % n
+    return list(zip(u.tolist(), v.tolist()))
+
+
+def zmierz(reprezentacja, n, krawedzie):
+    wyniki = {}
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    macierz = REPREZENTACJE[reprezentacja]()
+    for _ in range(n):
+        macierz.dodaj_wierzcholek()
+    for u, v in krawedzie:
+        macierz.zwieksz(u, v)
+        macierz.zwieksz(v, u)
+    wyniki['dodawanie'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n):
+        macierz.suma_wiersza(i)
+    wyniki['stopnie'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    macierz.sumy_wierszy()
+    wyniki['min_max'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for u, v in krawedzie[:len(krawedzie) // 2]:
+        macierz.zmniejsz(u, v)
+        macierz.zmniejsz(v, u)
+    wyniki['usuwanie'] = time.perf_counter() - start
+
+    wyniki['pamiec_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return wyniki
+
+
+def main():
+    rozmiary = [int(n) for n in sys.argv[1:]] or [100, 1000, 5000]
+    kolumny = ['dodawanie', 'stopnie', 'min_max', 'usuwanie', 'pamiec_mb']
+
+    print(f"{'n':>8} {'m':>9} {'reprezentacja':>14} " + ' '.join(f"{k:>11}" for k in kolumny))
+    for n in rozmiary:
+        krawedzie = losowe_krawedzie(n, SREDNI_STOPIEN)
+        for reprezentacja in REPREZENTACJE:
+            wyniki = zmierz(reprezentacja, n, krawedzie)
+            print(f"{n:>8} {len(krawedzie):>9} {reprezentacja:>14} " + ' '.join(f"{wyniki[k]:>11.4f}" for k in kolumny))
+
+
+if __name__ == "__main__":
+    main()
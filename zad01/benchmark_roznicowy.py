@@ -0,0 +1,217 @@
+"""
+Różnicowy benchmark dwóch implementacji tego samego API grafu:
+- main.py         -> macierz sąsiedztwa (reprezentacja gęsta i rzadka),
+- main_builtin.py -> MultiGraph / MultiDiGraph z biblioteki networkX albo słowniki liczników krawędzi (kompaktowy).
+
+Dla każdego rozmiaru generowany jest losowy multigraf (bez pętli), a następnie na każdej implementacji
+wykonywana jest ta sama losowa sekwencja operacji. Wyniki zapytań o stopnie są porównywane między
+implementacjami, a dla każdego rodzaju operacji mierzona jest przepustowość, percentyle czasu
+i szczytowy przyrost pamięci. Wyniki zapisywane są do pliku JSON; podanie poprzedniego pliku
+(--porownaj) wypisuje operacje, których przepustowość spadła o więcej niż --prog procent.
+
+Uruchomienie:
+python benchmark_roznicowy.py
+python benchmark_roznicowy.py --rozmiary 100 1000 --operacje 2000 --wyjscie nowe.json --porownaj stare.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+import main as graf_macierz
+import main_builtin
+from wsadowy import metoda
+
+SREDNI_STOPIEN = 8
+MAKS_GESTA = 10_000
+
+# względna częstość operacji w losowej sekwencji
+CZESTOSCI = {
+    'dodaj_krawedz': 30,
+    'usun_krawedz': 20,
+    'dodaj_wierzcholek': 5,
+    'usun_wierzcholek': 5,
+    'stopien_wierzcholka': 30,
+    'min_max_stopien': 4,
+    'parzysty_nieparzysty_stopien': 4,
+    'posortowane_stopnie': 2,
+}
+ZAPYTANIA = ('stopien_wierzcholka', 'min_max_stopien', 'parzysty_nieparzysty_stopien', 'posortowane_stopnie')
+
+
+def losowe_krawedzie(rng, n):
+    m = n * SREDNI_STOPIEN // 2
+    u = rng.integers(0, n, m)
+    v = rng.integers(0, n, m)
+    petle = u == v
+    v[petle] = (v[petle] + 1) % n
+    return np.column_stack((u, v))
+
+
+def losowe_operacje(rng, n, liczba):
+    nazwy = list(CZESTOSCI)
+    p = np.array([CZESTOSCI[nazwa] for nazwa in nazwy], dtype=float)
+    rodzaje = rng.choice(len(nazwy), size=liczba, p=p / p.sum())
+    # etykiety także spoza grafu, żeby sprawdzić obsługę błędów
+    u = rng.integers(0, n + n // 10 + 1, liczba).tolist()
+    v = rng.integers(0, n + n // 10 + 1, liczba).tolist()
+
+    operacje = []
+    for rodzaj, a, b in zip(rodzaje.tolist(), u, v):
+        nazwa = nazwy[rodzaj]
+        if nazwa in ('dodaj_krawedz', 'usun_krawedz'):
+            if a == b:
+                b = a + 1  # pętle są dozwolone tylko w main_builtin.py
+            operacje.append((nazwa, (a, b)))
+        elif nazwa in ('dodaj_wierzcholek', 'usun_wierzcholek', 'stopien_wierzcholka'):
+            operacje.append((nazwa, (a,)))
+        else:
+            operacje.append((nazwa, ()))
+    return operacje
+
+
+def zbuduj(implementacja, skierowany, n, krawedzie):
+    if implementacja == 'networkx':
+        graf = main_builtin.GrafSkierowany() if skierowany else main_builtin.GrafNieskierowany()
+        graf.graph.add_nodes_from(range(n))
+        graf.graph.add_edges_from(krawedzie.tolist())
+        return graf
+    if implementacja == 'networkx_kompaktowy':
+        graf = main_builtin.GrafSkierowany(kompaktowy=True) if skierowany else main_builtin.GrafNieskierowany(kompaktowy=True)
+        for v in range(n):
+            graf.graph.add_node(v)
+        for u, v in krawedzie.tolist():
+            graf.graph.add_edge(u, v)
+        return graf
+
+    klasa = graf_macierz.GrafSkierowany if skierowany else graf_macierz.GrafNieskierowany
+    reprezentacja = 'gesta' if implementacja == 'macierz_gesta' else 'rzadka'
+    # pary (i, i) są pomijane jako pętle, ale rejestrują wierzchołki izolowane
+    petle = np.column_stack((np.arange(n), np.arange(n)))
+    return klasa.z_krawedzi(np.vstack((krawedzie, petle)), reprezentacja=reprezentacja, cichy=True)
+
+
+def wykonaj(graf, operacje, implementacja, z_pamiecia):
+    czasy, pamiec, wyniki = {}, {}, []
+    builtin = implementacja.startswith('networkx')
+    for nazwa, argumenty in operacje:
+        funkcja = metoda(graf, nazwa, builtin)
+        if funkcja is None:
+            wyniki.append(None)
+            continue
+        if z_pamiecia:
+            tracemalloc.reset_peak()
+            przed = tracemalloc.get_traced_memory()[0]
+        poczatek = time.perf_counter_ns()
+        wynik = funkcja(*argumenty)
+        czasy.setdefault(nazwa, []).append(time.perf_counter_ns() - poczatek)
+        if z_pamiecia:
+            pamiec[nazwa] = max(pamiec.get(nazwa, 0), tracemalloc.get_traced_memory()[1] - przed)
+        wyniki.append(list(wynik) if isinstance(wynik, tuple) else wynik)
+    return czasy, pamiec, wyniki
+
+
+def zmierz(implementacja, skierowany, n, krawedzie, operacje):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        graf = zbuduj(implementacja, skierowany, n, krawedzie)
+        czas_budowy = time.perf_counter() - start
+        czasy, _, wyniki = wykonaj(graf, operacje, implementacja, z_pamiecia=False)
+
+        tracemalloc.start()
+        graf = zbuduj(implementacja, skierowany, n, krawedzie)
+        pamiec_grafu = tracemalloc.get_traced_memory()[0]
+        _, pamiec, _ = wykonaj(graf, operacje, implementacja, z_pamiecia=True)
+        tracemalloc.stop()
+
+    statystyki = {}
+    for nazwa, pomiary in czasy.items():
+        pomiary = np.array(pomiary) / 1000
+        statystyki[nazwa] = {
+            'liczba': len(pomiary),
+            'operacji_na_s': float(len(pomiary) / max(pomiary.sum() / 1e6, 1e-9)),
+            'p50_us': float(np.percentile(pomiary, 50)),
+            'p99_us': float(np.percentile(pomiary, 99)),
+            'szczyt_pamieci_kb': pamiec.get(nazwa, 0) / 1024,
+        }
+    return {
+        'budowa_s': czas_budowy,
+        'pamiec_grafu_mb': pamiec_grafu / 2**20,
+        'operacje': statystyki,
+    }, wyniki
+
+
+def niezgodnosci(operacje, wyniki_a, wyniki_b):
+    rozne = []
+    for (nazwa, argumenty), a, b in zip(operacje, wyniki_a, wyniki_b):
+        if nazwa in ZAPYTANIA and a is not None and b is not None and a != b:
+            rozne.append({'operacja': nazwa, 'argumenty': list(argumenty), 'wyniki': [a, b]})
+    return rozne
+
+
+def porownaj(poprzednie, obecne, prog):
+    klucz = lambda w: (w['n'], w['skierowany'], w['implementacja'])
+    stare = {klucz(w): w for w in poprzednie['wyniki']}
+    for wynik in obecne['wyniki']:
+        if klucz(wynik) not in stare:
+            continue
+        for nazwa, s in wynik['operacje'].items():
+            poprzednia = stare[klucz(wynik)]['operacje'].get(nazwa)
+            if poprzednia and s['operacji_na_s'] < poprzednia['operacji_na_s'] * (1 - prog / 100):
+                spadek = 100 * (1 - s['operacji_na_s'] / poprzednia['operacji_na_s'])
+                print(f"REGRESJA n={wynik['n']} {'skierowany' if wynik['skierowany'] else 'nieskierowany'} "
+                      f"{wynik['implementacja']} {nazwa}: {poprzednia['operacji_na_s']:.0f} -> {s['operacji_na_s']:.0f} op/s (-{spadek:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Różnicowy benchmark main.py i main_builtin.py.")
+    parser.add_argument('--rozmiary', type=int, nargs='+', default=[100, 1000, 10_000, 100_000])
+    parser.add_argument('--operacje', type=int, default=2000, help="liczba operacji w sekwencji")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--wyjscie', default='benchmark_roznicowy.json')
+    parser.add_argument('--porownaj', help="poprzedni plik JSON z wynikami")
+    parser.add_argument('--prog', type=float, default=20, help="próg regresji w procentach")
+    args = parser.parse_args()
+
+    raport = {
+        'parametry': dict(vars(args), python=platform.python_version(), numpy=np.__version__, networkx=main_builtin.nx.__version__),
+        'wyniki': [],
+        'zgodnosc': [],
+    }
+    for n in args.rozmiary:
+        rng = np.random.default_rng(args.seed + n)
+        krawedzie = losowe_krawedzie(rng, n)
+        operacje = losowe_operacje(rng, n, args.operacje)
+        implementacje = (['macierz_gesta'] if n <= MAKS_GESTA else []) + ['macierz_rzadka', 'networkx_kompaktowy', 'networkx']
+
+        for skierowany in (False, True):
+            wyniki_zapytan = {}
+            for implementacja in implementacje:
+                wynik, wyniki_zapytan[implementacja] = zmierz(implementacja, skierowany, n, krawedzie, operacje)
+                raport['wyniki'].append(dict(n=n, skierowany=skierowany, implementacja=implementacja, **wynik))
+                print(f"n={n:>7} {'skierowany' if skierowany else 'nieskierowany':>13} {implementacja:>19}: "
+                      f"budowa {wynik['budowa_s']:.3f} s, pamięć {wynik['pamiec_grafu_mb']:.1f} MB, "
+                      + ', '.join(f"{nazwa} {s['operacji_na_s']:.0f} op/s" for nazwa, s in sorted(wynik['operacje'].items())))
+
+            for implementacja in implementacje[:-1]:
+                rozne = niezgodnosci(operacje, wyniki_zapytan[implementacja], wyniki_zapytan['networkx'])
+                raport['zgodnosc'].append({'n': n, 'skierowany': skierowany, 'implementacje': [implementacja, 'networkx'],
+                                           'niezgodnosci': len(rozne), 'przyklady': rozne[:5]})
+                if rozne:
+                    print(f"UWAGA: {len(rozne)} niezgodnych wyników zapytań między {implementacja} a networkx (n={n})")
+
+    with open(args.wyjscie, 'w') as plik:
+        json.dump(raport, plik, indent=2, ensure_ascii=False, default=int)
+    print(f"Wyniki zapisano do pliku {args.wyjscie}")
+
+    if args.porownaj:
+        with open(args.porownaj, 'r') as plik:
+            porownaj(json.load(plik), raport, args.prog)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Macierz sąsiedztwa zapisana jako zbiory bitowe: wiersz i to n bitów upakowanych w słowa uint64,
+bit j jest ustawiony, gdy istnieje krawędź i -> j (krotność nie ma znaczenia dla przeszukiwania).
+
+Rozszerzenie frontu przeszukiwania wszerz to OR wierszy wszystkich wierzchołków frontu
+(np.bitwise_or.reduce po słowach), a odrzucenie odwiedzonych wierzchołków to jedno AND NOT,
+więc jeden poziom BFS kosztuje O(|front| * n / 64) operacji na słowach zamiast pętli po sąsiadach.
+Macierz może być aktualizowana w miejscu (ustaw, wyczysc, dodaj_wierzcholek, usun_wierzcholek),
+dzięki czemu graf nie musi jej budować od nowa przy każdym zapytaniu.
+"""
+
+import numpy as np
+
+BITY_SLOWA = 64
+
+
+class MacierzBitowa:
+    def __init__(self, n, wiersze, kolumny):
+        self.n = n
+        self.liczba_slow = max(1, (n + BITY_SLOWA - 1) // BITY_SLOWA)
+        self.slowa = np.zeros((n, self.liczba_slow), dtype=np.uint64)
+        kolumny = np.asarray(kolumny, dtype=np.int64)
+        bity = np.left_shift(np.uint64(1), (kolumny % BITY_SLOWA).astype(np.uint64))
+        np.bitwise_or.at(self.slowa, (np.asarray(wiersze, dtype=np.int64), kolumny // BITY_SLOWA), bity)
+
+    @staticmethod
+    def _bit(j):
+        return j // BITY_SLOWA, np.uint64(1 << (j % BITY_SLOWA))
+
+    def ustaw(self, i, j):
+        k, bit = self._bit(j)
+        self.slowa[i, k] |= bit
+
+    def wyczysc(self, i, j):
+        k, bit = self._bit(j)
+        self.slowa[i, k] &= ~bit
+
+    def dodaj_wierzcholek(self):
+        # wiersze i słowa rosną niezależnie i geometrycznie, więc realokacji jest O(log n)
+        wiersze = self.slowa.shape[0]
+        if self.n == wiersze:
+            wiersze = max(1, 2 * wiersze)
+        liczba_slow = self.liczba_slow
+        if self.n + 1 > liczba_slow * BITY_SLOWA:
+            liczba_slow = 2 * liczba_slow
+        if (wiersze, liczba_slow) != self.slowa.shape:
+            nowe = np.zeros((wiersze, liczba_slow), dtype=np.uint64)
+            nowe[:self.n, :self.liczba_slow] = self.slowa[:self.n]
+            self.slowa, self.liczba_slow = nowe, liczba_slow
+        self.n += 1
+        return self.n - 1
+
+    def wyczysc_wierzcholek(self, index):
+        k, bit = self._bit(index)
+        self.slowa[index] = 0
+        self.slowa[:self.n, k] &= ~bit
+
+    def usun_wierzcholek(self, index):
+        # tak jak w macierzy sąsiedztwa: ostatni wierzchołek przechodzi na miejsce usuniętego
+        self.wyczysc_wierzcholek(index)
+        ostatni = self.n - 1
+        if index != ostatni:
+            self.slowa[index] = self.slowa[ostatni]
+            k, bit = self._bit(ostatni)
+            wiersze = np.flatnonzero(self.slowa[:ostatni + 1, k] & bit)
+            k, bit = self._bit(index)
+            self.slowa[wiersze, k] |= bit
+            self.wyczysc_wierzcholek(ostatni)
+        self.n -= 1
+
+    def zbior(self, indeksy):
+        zbior = np.zeros(self.liczba_slow, dtype=np.uint64)
+        indeksy = np.asarray(indeksy, dtype=np.int64)
+        np.bitwise_or.at(zbior, indeksy // BITY_SLOWA, np.left_shift(np.uint64(1), (indeksy % BITY_SLOWA).astype(np.uint64)))
+        return zbior
+
+    def elementy(self, zbior):
+        bity = np.unpackbits(zbior.view(np.uint8), bitorder='little')[:self.n]
+        return np.flatnonzero(bity)
+
+    def sasiedzi(self, zbior):
+        indeksy = self.elementy(zbior)
+        if len(indeksy) == 0:
+            return np.zeros(self.liczba_slow, dtype=np.uint64)
+        return np.bitwise_or.reduce(self.slowa[indeksy], axis=0)
+
+    def poziomy(self, start, dozwolone=None):
+        odwiedzone = self.zbior([start])
+        nieodwiedzone = ~odwiedzone if dozwolone is None else dozwolone & ~odwiedzone
+        front = odwiedzone
+        poziomy = [np.array([start], dtype=np.int64)]
+        while True:
+            front = self.sasiedzi(front) & nieodwiedzone
+            if not front.any():
+                return poziomy, odwiedzone
+            nieodwiedzone &= ~front
+            odwiedzone |= front
+            poziomy.append(self.elementy(front))
+
+    def dfs(self, start):
+        nieodwiedzone = ~self.zbior([start])
+        kolejnosc = [start]
+        stos = [start]
+        while stos:
+            # pierwszy nieodwiedzony sąsiad wierzchołka ze szczytu stosu: AND NOT na słowach wiersza
+            kandydaci = self.slowa[stos[-1]] & nieodwiedzone
+            slowo = np.flatnonzero(kandydaci)
+            if len(slowo) == 0:
+                stos.pop()
+                continue
+            k = int(slowo[0])
+            wartosc = int(kandydaci[k])
+            v = k * BITY_SLOWA + (wartosc & -wartosc).bit_length() - 1
+            nieodwiedzone[k] &= ~np.uint64(1 << (v % BITY_SLOWA))
+            kolejnosc.append(v)
+            stos.append(v)
+        return kolejnosc
+
+    def skladowe(self, indeksy):
+        # numer składowej dla każdego z podanych wierzchołków (macierz musi być symetryczna)
+        numery = np.full(self.n, -1, dtype=np.int64)
+        pozostale = self.zbior(indeksy)
+        numer = 0
+        while pozostale.any():
+            start = int(self.elementy(pozostale)[0])
+            _, odwiedzone = self.poziomy(start, pozostale)
+            numery[self.elementy(odwiedzone)] = numer
+            pozostale &= ~odwiedzone
+            numer += 1
+        return numery[indeksy]
@@ -0,0 +1,66 @@
+"""
+Strumieniowy zapis macierzy sąsiedztwa do dowolnego pliku (lub obiektu plikowego).
+
+Macierz jest przetwarzana blokami wierszy, a każdy blok trafia do pliku jednym wywołaniem write,
+dzięki czemu zapis dużych macierzy jest ograniczony szybkością wejścia/wyjścia, a nie interpretera.
+
+Tryby:
+'gesty'  -> tekst w formacie wyswietl_macierz: nagłówek z etykietami i wiersze "etykieta [a b c ...]"
+'trojki' -> tylko niezerowe komórki, po jednej w linii: "u, v, krotność"
+'npy'    -> binarny plik .npy (plik musi być otwarty w trybie binarnym)
+"""
+
+import numpy as np
+
+KOMOREK_W_BLOKU = 1 << 22
+
+
+def _wiersze_tekstowe(etykiety, blok):
+    if blok.shape[1] and blok.max() < 10:
+        # wszystkie krotności jednocyfrowe: wiersz tekstu składany bezpośrednio z bajtów
+        znaki = np.full((blok.shape[0], 2 * blok.shape[1]), ord(' '), dtype=np.uint8)
+        znaki[:, 0::2] = blok + ord('0')
+        znaki[:, -1] = ord(']')
+        tresc = znaki.tobytes().decode('ascii')
+        szerokosc = znaki.shape[1]
+        return ''.join(f"{etykieta} [{tresc[i * szerokosc:(i + 1) * szerokosc]}\n" for i, etykieta in enumerate(etykiety))
+    return ''.join(f"{etykieta} [{' '.join(map(str, wiersz))}]\n" for etykieta, wiersz in zip(etykiety, blok.tolist()))
+
+
+def _trojki_tekstowe(etykiety_wierszy, etykiety_kolumn, blok):
+    wiersze, kolumny = np.nonzero(blok)
+    krotnosci = blok[wiersze, kolumny].tolist()
+    etykiety_u = etykiety_wierszy[wiersze].tolist()
+    etykiety_v = etykiety_kolumn[kolumny].tolist()
+    return ''.join(f"{u}, {v}, {k}\n" for u, v, k in zip(etykiety_u, etykiety_v, krotnosci))
+
+
+def zapisz_macierz(macierz, etykiety, zywe, plik, tryb='gesty', wiersze=None, kolumny=None):
+    if tryb not in ('gesty', 'trojki', 'npy'):
+        raise ValueError(f"Nieznany tryb zapisu macierzy: {tryb}")
+
+    indeksy_wierszy = zywe[slice(*wiersze) if wiersze else slice(None)]
+    indeksy_kolumn = zywe[slice(*kolumny) if kolumny else slice(None)]
+    etykiety = np.array(etykiety, dtype=object)
+    etykiety_wierszy = etykiety[indeksy_wierszy]
+    etykiety_kolumn = etykiety[indeksy_kolumn]
+    wierszy_w_bloku = max(1, KOMOREK_W_BLOKU // max(1, len(indeksy_kolumn)))
+
+    if tryb == 'gesty':
+        plik.write(f"   {' '.join(map(str, etykiety_kolumn))}\n")
+    elif tryb == 'npy':
+        np.lib.format.write_array_header_1_0(plik, {
+            'descr': np.lib.format.dtype_to_descr(macierz.dtype),
+            'fortran_order': False,
+            'shape': (len(indeksy_wierszy), len(indeksy_kolumn)),
+        })
+
+    for poczatek in range(0, len(indeksy_wierszy), wierszy_w_bloku):
+        koniec = poczatek + wierszy_w_bloku
+        blok = macierz.blok(indeksy_wierszy[poczatek:koniec], indeksy_kolumn)
+        if tryb == 'gesty':
+            plik.write(_wiersze_tekstowe(etykiety_wierszy[poczatek:koniec], blok))
+        elif tryb == 'trojki':
+            plik.write(_trojki_tekstowe(etykiety_wierszy[poczatek:koniec], etykiety_kolumn, blok))
+        else:
+            plik.write(np.ascontiguousarray(blok).tobytes())
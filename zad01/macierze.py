@@ -0,0 +1,266 @@
+import numpy as np
+
+
+class MacierzGesta:
+    def __init__(self, dtype=np.uint8, pojemnosc=16):
+        self.dtype = np.dtype(dtype)
+        self.maks_krotnosc = np.iinfo(self.dtype).max
+        self.dane = np.zeros((pojemnosc, pojemnosc), dtype=self.dtype)
+        self.rozmiar = 0
+
+    def widok(self):
+        return self.dane[:self.rozmiar, :self.rozmiar]
+
+    def wiersz(self, index):
+        return self.dane[index, :self.rozmiar]
+
+    def niezerowe(self):
+        wiersze, kolumny = np.nonzero(self.widok())
+        return wiersze, kolumny, self.dane[wiersze, kolumny].astype(np.int64)
+
+    def blok(self, wiersze, kolumny):
+        return self.dane[np.ix_(wiersze, kolumny)]
+
+    def sasiedzi_wyjsciowi(self, index):
+        wiersz = self.wiersz(index)
+        sasiedzi = np.flatnonzero(wiersz)
+        return sasiedzi, wiersz[sasiedzi]
+
+    def sasiedzi_wejsciowi(self, index):
+        kolumna = self.dane[:self.rozmiar, index]
+        sasiedzi = np.flatnonzero(kolumna)
+        return sasiedzi, kolumna[sasiedzi]
+
+    def _powieksz(self, pojemnosc):
+        nowe = np.zeros((pojemnosc, pojemnosc), dtype=self.dtype)
+        nowe[:self.rozmiar, :self.rozmiar] = self.widok()
+        self.dane = nowe
+
+    def wczytaj(self, n, wiersze, kolumny, krotnosci):
+        if len(krotnosci) and krotnosci.max() > self.maks_krotnosc:
+            raise OverflowError(f"Przekroczono maksymalną krotność krawędzi ({self.maks_krotnosc}).")
+        self.dane = np.zeros((max(n, 1), max(n, 1)), dtype=self.dtype)
+        self.dane[wiersze, kolumny] = krotnosci
+        self.rozmiar = n
+
+    def do_migawki(self):
+        return {'macierz': self.widok()}
+
+    def z_migawki(self, n, tablice):
+        self.dane = tablice['macierz']
+        self.rozmiar = n
+
+    def dodaj_wierzcholek(self):
+        if self.rozmiar == self.dane.shape[0]:
+            self._powieksz(max(1, 2 * self.rozmiar))
+        self.rozmiar += 1
+        return self.rozmiar - 1
+
+    def usun_wierzcholek(self, index):
+        ostatni = self.rozmiar - 1
+        if index != ostatni:
+            self.dane[index, :ostatni + 1] = self.dane[ostatni, :ostatni + 1]
+            self.dane[:ostatni + 1, index] = self.dane[:ostatni + 1, ostatni]
+        self.wyczysc_wierzcholek(ostatni)
+        self.rozmiar -= 1
+
+    def wyczysc_wierzcholek(self, index):
+        self.dane[index, :self.rozmiar] = 0
+        self.dane[:self.rozmiar, index] = 0
+
+    def kompaktuj(self, zywe):
+        k = len(zywe)
+        self.dane[:k, :k] = self.dane[np.ix_(zywe, zywe)]
+        self.dane[k:self.rozmiar, :self.rozmiar] = 0
+        self.dane[:self.rozmiar, k:self.rozmiar] = 0
+        self.rozmiar = k
+
+    def wartosc(self, i, j):
+        return int(self.dane[i, j])
+
+    def zwieksz(self, i, j):
+        if self.dane[i, j] == self.maks_krotnosc:
+            raise OverflowError(f"Przekroczono maksymalną krotność krawędzi ({self.maks_krotnosc}).")
+        self.dane[i, j] += 1
+
+    def zmniejsz(self, i, j):
+        self.dane[i, j] -= 1
+
+    def suma_wiersza(self, index):
+        return int(self.dane[index, :self.rozmiar].sum(dtype=np.int64))
+
+    def suma_kolumny(self, index):
+        return int(self.dane[:self.rozmiar, index].sum(dtype=np.int64))
+
+    def sumy_wierszy(self):
+        return self.widok().sum(axis=1, dtype=np.int64)
+
+    def sumy_kolumn(self):
+        return self.widok().sum(axis=0, dtype=np.int64)
+
+
+class MacierzRzadka:
+    def __init__(self, dtype=np.uint8):
+        self.dtype = np.dtype(dtype)
+        self.maks_krotnosc = np.iinfo(self.dtype).max
+        self.wiersze = []
+        self.kolumny = []
+        self.rozmiar = 0
+        self._csr = None
+
+    def csr(self):
+        if self._csr is None:
+            dlugosci = np.fromiter((len(w) for w in self.wiersze), dtype=np.int64, count=self.rozmiar)
+            indptr = np.zeros(self.rozmiar + 1, dtype=np.int64)
+            np.cumsum(dlugosci, out=indptr[1:])
+            indices = np.empty(indptr[-1], dtype=np.int64)
+            data = np.empty(indptr[-1], dtype=self.dtype)
+            for i, wiersz in enumerate(self.wiersze):
+                poczatek, koniec = indptr[i], indptr[i + 1]
+                indices[poczatek:koniec] = sorted(wiersz)
+                data[poczatek:koniec] = [wiersz[j] for j in indices[poczatek:koniec]]
+            self._csr = (indptr, indices, data)
+        return self._csr
+
+    def wczytaj(self, n, wiersze, kolumny, krotnosci):
+        if len(krotnosci) and krotnosci.max() > self.maks_krotnosc:
+            raise OverflowError(f"Przekroczono maksymalną krotność krawędzi ({self.maks_krotnosc}).")
+        self.rozmiar = n
+        self.wiersze = self._grupuj(n, wiersze, kolumny, krotnosci)
+        self.kolumny = self._grupuj(n, kolumny, wiersze, krotnosci)
+        self._csr = None
+
+    def do_migawki(self):
+        indptr, indices, data = self.csr()
+        return {'indptr': indptr, 'indices': indices, 'data': data}
+
+    def z_migawki(self, n, tablice):
+        indptr, indices, data = tablice['indptr'], tablice['indices'], tablice['data']
+        wiersze = np.repeat(np.arange(n), np.diff(indptr))
+        self.wczytaj(n, wiersze, indices, data)
+        self._csr = (indptr, indices, data)
+
+    @staticmethod
+    def _grupuj(n, klucze, wartosci, krotnosci):
+        kolejnosc = np.argsort(klucze, kind='stable')
+        granice = np.searchsorted(klucze[kolejnosc], np.arange(n + 1))
+        wartosci = wartosci[kolejnosc].tolist()
+        krotnosci = krotnosci[kolejnosc].tolist()
+        return [dict(zip(wartosci[granice[i]:granice[i + 1]], krotnosci[granice[i]:granice[i + 1]])) for i in range(n)]
+
+    def widok(self):
+        macierz = np.zeros((self.rozmiar, self.rozmiar), dtype=self.dtype)
+        indptr, indices, data = self.csr()
+        wiersze = np.repeat(np.arange(self.rozmiar), np.diff(indptr))
+        macierz[wiersze, indices] = data
+        return macierz
+
+    def wiersz(self, index):
+        wiersz = np.zeros(self.rozmiar, dtype=self.dtype)
+        for j, krotnosc in self.wiersze[index].items():
+            wiersz[j] = krotnosc
+        return wiersz
+
+    def niezerowe(self):
+        indptr, indices, data = self.csr()
+        wiersze = np.repeat(np.arange(self.rozmiar), np.diff(indptr))
+        return wiersze, indices, data.astype(np.int64)
+
+    def blok(self, wiersze, kolumny):
+        pozycje = np.full(self.rozmiar, -1, dtype=np.int64)
+        pozycje[kolumny] = np.arange(len(kolumny))
+        blok = np.zeros((len(wiersze), len(kolumny)), dtype=self.dtype)
+        for i, index in enumerate(wiersze):
+            sasiedzi, krotnosci = self.sasiedzi_wyjsciowi(index)
+            pozycje_sasiadow = pozycje[sasiedzi]
+            w_oknie = pozycje_sasiadow >= 0
+            blok[i, pozycje_sasiadow[w_oknie]] = krotnosci[w_oknie]
+        return blok
+
+    def sasiedzi_wyjsciowi(self, index):
+        wiersz = self.wiersze[index]
+        return np.fromiter(wiersz.keys(), dtype=np.int64, count=len(wiersz)), np.fromiter(wiersz.values(), dtype=np.int64, count=len(wiersz))
+
+    def sasiedzi_wejsciowi(self, index):
+        kolumna = self.kolumny[index]
+        return np.fromiter(kolumna.keys(), dtype=np.int64, count=len(kolumna)), np.fromiter(kolumna.values(), dtype=np.int64, count=len(kolumna))
+
+    def dodaj_wierzcholek(self):
+        self.wiersze.append({})
+        self.kolumny.append({})
+        self.rozmiar += 1
+        self._csr = None
+        return self.rozmiar - 1
+
+    def usun_wierzcholek(self, index):
+        self.wyczysc_wierzcholek(index)
+        ostatni = self.rozmiar - 1
+        if index != ostatni:
+            for j, krotnosc in self.wiersze[ostatni].items():
+                del self.kolumny[j][ostatni]
+                self.kolumny[j][index] = krotnosc
+            for i, krotnosc in self.kolumny[ostatni].items():
+                del self.wiersze[i][ostatni]
+                self.wiersze[i][index] = krotnosc
+            self.wiersze[index] = self.wiersze[ostatni]
+            self.kolumny[index] = self.kolumny[ostatni]
+        self.wiersze.pop()
+        self.kolumny.pop()
+        self.rozmiar -= 1
+        self._csr = None
+
+    def wyczysc_wierzcholek(self, index):
+        for j in self.wiersze[index]:
+            del self.kolumny[j][index]
+        for i in self.kolumny[index]:
+            del self.wiersze[i][index]
+        self.wiersze[index] = {}
+        self.kolumny[index] = {}
+        self._csr = None
+
+    def kompaktuj(self, zywe):
+        nowy_index = {stary: nowy for nowy, stary in enumerate(zywe)}
+        przenumeruj = lambda mapa: {nowy_index[k]: c for k, c in mapa.items()}
+        self.wiersze = [przenumeruj(self.wiersze[i]) for i in zywe]
+        self.kolumny = [przenumeruj(self.kolumny[i]) for i in zywe]
+        self.rozmiar = len(zywe)
+        self._csr = None
+
+    def wartosc(self, i, j):
+        return self.wiersze[i].get(j, 0)
+
+    def zwieksz(self, i, j):
+        krotnosc = self.wiersze[i].get(j, 0)
+        if krotnosc == self.maks_krotnosc:
+            raise OverflowError(f"Przekroczono maksymalną krotność krawędzi ({self.maks_krotnosc}).")
+        self.wiersze[i][j] = krotnosc + 1
+        self.kolumny[j][i] = krotnosc + 1
+        self._csr = None
+
+    def zmniejsz(self, i, j):
+        krotnosc = self.wiersze[i][j] - 1
+        if krotnosc == 0:
+            del self.wiersze[i][j]
+            del self.kolumny[j][i]
+        else:
+            self.wiersze[i][j] = krotnosc
+            self.kolumny[j][i] = krotnosc
+        self._csr = None
+
+    def suma_wiersza(self, index):
+        return sum(self.wiersze[index].values())
+
+    def suma_kolumny(self, index):
+        return sum(self.kolumny[index].values())
+
+    def sumy_wierszy(self):
+        return np.fromiter((sum(w.values()) for w in self.wiersze), dtype=np.int64, count=self.rozmiar)
+
+    def sumy_kolumn(self):
+        return np.fromiter((sum(k.values()) for k in self.kolumny), dtype=np.int64, count=self.rozmiar)
+
+
+REPREZENTACJE = {
+    'gesta': MacierzGesta,
+    'rzadka': MacierzRzadka,
+}
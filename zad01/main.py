@@ -1,208 +1,442 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
 import sys
 import itertools as it
+from macierze import REPREZENTACJE, MacierzRzadka
+from stopnie import IndeksStopni
+from zapis import Sesja, zapisz_migawke, wczytaj_migawke
+import eksport
+from bitowe import MacierzBitowa
+from przeszukiwanie import SasiedztwoRzadkie
+
+MAKS_WIERZCHOLKOW_RYSUNKU = 200
 
 class Graf:
-    def __init__(self):
-        self.macierz_sasiedztwa = []
+    skierowany = False
+
+    def __init__(self, dtype=np.uint8, reprezentacja='gesta', leniwe_usuwanie=False, cichy=False):
+        self.macierz_sasiedztwa = REPREZENTACJE[reprezentacja](dtype)
+        self.stopnie = IndeksStopni(self.skierowany)
         self.wierzcholki = {}
+        self.etykiety = []
+        self.leniwe_usuwanie = leniwe_usuwanie
+        self.liczba_usunietych = 0
+        self.cichy = cichy
+        # macierze bitowe do przeszukiwania, budowane przy pierwszym zapytaniu i aktualizowane przy każdej zmianie
+        self._bitowe = {}
+
+    @classmethod
+    def z_krawedzi(cls, krawedzie, **kwargs):
+        graf = cls(**kwargs)
+        krawedzie = np.asarray(krawedzie, dtype=np.int64).reshape(-1, 2)
+
+        # indeksy nadawane w kolejności pierwszego wystąpienia, tak jak przy dodawaniu krawędzi pojedynczo
+        wartosci, pierwsze, odwrotne = np.unique(krawedzie.ravel(), return_index=True, return_inverse=True)
+        kolejnosc = np.argsort(pierwsze)
+        ranga = np.empty_like(kolejnosc)
+        ranga[kolejnosc] = np.arange(len(kolejnosc))
+        indeksy = ranga[odwrotne].reshape(-1, 2)
+
+        u, v = indeksy[:, 0], indeksy[:, 1]
+        bez_petli = u != v
+        u, v = u[bez_petli], v[bez_petli]
+        if not cls.skierowany:
+            u, v = np.concatenate((u, v)), np.concatenate((v, u))
+
+        n = len(wartosci)
+        pary, krotnosci = np.unique(u * n + v, return_counts=True)
+        graf.macierz_sasiedztwa.wczytaj(n, pary // n, pary % n, krotnosci)
+        graf.stopnie.wczytaj(n, pary // n, pary % n, krotnosci)
+        graf.etykiety = wartosci[kolejnosc].tolist()
+        graf.wierzcholki = {etykieta: i for i, etykieta in enumerate(graf.etykiety)}
+        return graf
+
+    @classmethod
+    def z_pliku(cls, nazwa_pliku, **kwargs):
+        with open(nazwa_pliku, 'r') as plik:
+            liczby = np.array(plik.read().replace(',', ' ').split(), dtype=np.int64)
+        return cls.z_krawedzi(liczby, **kwargs)
+
+    def zapisz_migawke(self, sciezka, numer_operacji=0):
+        if self.liczba_usunietych:
+            self.kompaktuj()
+        n = len(self.etykiety)
+        naglowek = {
+            'skierowany': self.skierowany,
+            'reprezentacja': type(self.macierz_sasiedztwa).__name__,
+            'dtype': self.macierz_sasiedztwa.dtype.str,
+            'numer_operacji': numer_operacji,
+        }
+        tablice = dict(self.macierz_sasiedztwa.do_migawki(),
+                       etykiety=np.array(self.etykiety, dtype=np.int64),
+                       wyj=self.stopnie.wyj[:n],
+                       wej=self.stopnie.wej[:n])
+        zapisz_migawke(sciezka, naglowek, tablice)
+
+    @classmethod
+    def z_migawki(cls, sciezka, **kwargs):
+        naglowek, tablice = wczytaj_migawke(sciezka)
+        if naglowek['skierowany'] != cls.skierowany:
+            raise ValueError(f"Migawka '{sciezka}' zawiera graf innego rodzaju.")
+
+        reprezentacja = {typ.__name__: nazwa for nazwa, typ in REPREZENTACJE.items()}[naglowek['reprezentacja']]
+        graf = cls(**dict(kwargs, dtype=naglowek['dtype'], reprezentacja=reprezentacja))
+        graf.macierz_sasiedztwa.z_migawki(len(tablice['etykiety']), tablice)
+        graf.stopnie.ustaw(tablice['wyj'], tablice['wej'])
+        graf.etykiety = tablice['etykiety'].tolist()
+        graf.wierzcholki = {etykieta: i for i, etykieta in enumerate(graf.etykiety)}
+        return graf, naglowek['numer_operacji']
+
+    def komunikat(self, tekst):
+        if not self.cichy:
+            print(tekst)
 
     def dodaj_wierzcholek(self, etykieta):
         try:
             etykieta = int(etykieta)
             if etykieta in self.wierzcholki:
-                print(f"Wierzchołek {etykieta} już istnieje.")
+                self.komunikat(f"Wierzchołek {etykieta} już istnieje.")
                 return
 
-            self.macierz_sasiedztwa.append([0] * (len(self.macierz_sasiedztwa) + 1))
-            for wiersz in self.macierz_sasiedztwa[:-1]:
-                wiersz.append(0)
-
-            self.wierzcholki[etykieta] = len(self.macierz_sasiedztwa) - 1
-            print(f"Dodano wierzchołek {etykieta}")
+            index = self.macierz_sasiedztwa.dodaj_wierzcholek()
+            for macierz in self._bitowe.values():
+                macierz.dodaj_wierzcholek()
+            self.stopnie.dodaj_wierzcholek(index)
+            self.wierzcholki[etykieta] = index
+            self.etykiety.append(etykieta)
+            self.komunikat(f"Dodano wierzchołek {etykieta}")
+            return True
 
         except ValueError:
-            print(f"Niepoprawny wierzchołek: {etykieta}. Musi być on liczbą całkowitą.")
+            self.komunikat(f"Niepoprawny wierzchołek: {etykieta}. Musi być on liczbą całkowitą.")
             return
 
     def usun_wierzcholek(self, etykieta):
         try:
             etykieta = int(etykieta)
             if etykieta not in self.wierzcholki:
-                print(f"Wierzchołek {etykieta} nie istnieje.")
+                self.komunikat(f"Wierzchołek {etykieta} nie istnieje.")
                 return
 
-            index = self.wierzcholki[etykieta]
-            self.macierz_sasiedztwa.pop(index)
-            for wiersz in self.macierz_sasiedztwa:
-                wiersz.pop(index)
-            del self.wierzcholki[etykieta]
+            index = self.wierzcholki.pop(etykieta)
+            self.stopnie.odlacz(index, *self.macierz_sasiedztwa.sasiedzi_wyjsciowi(index), *self.macierz_sasiedztwa.sasiedzi_wejsciowi(index))
+            if self.leniwe_usuwanie:
+                self.macierz_sasiedztwa.wyczysc_wierzcholek(index)
+                for macierz in self._bitowe.values():
+                    macierz.wyczysc_wierzcholek(index)
+                self.etykiety[index] = None
+                self.liczba_usunietych += 1
+                if 2 * self.liczba_usunietych > len(self.etykiety):
+                    self.kompaktuj()
+            else:
+                self.macierz_sasiedztwa.usun_wierzcholek(index)
+                for macierz in self._bitowe.values():
+                    macierz.usun_wierzcholek(index)
+                self.stopnie.przenies_ostatni(index)
+                ostatnia = self.etykiety.pop()
+                if ostatnia != etykieta:
+                    self.etykiety[index] = ostatnia
+                    self.wierzcholki[ostatnia] = index
+            self.komunikat(f"Usunięto wierzchołek {etykieta}")
+            return True
+
+        except ValueError:
+            self.komunikat(f"Niepoprawny wierzchołek: {etykieta}. Musi być on liczbą całkowitą.")
+            return
+
+    def kompaktuj(self):
+        zywe = self.zywe_indeksy()
+        self.macierz_sasiedztwa.kompaktuj(zywe)
+        self._bitowe.clear()
+        self.stopnie.kompaktuj(zywe)
+        self.etykiety = [self.etykiety[i] for i in zywe]
+        self.wierzcholki = {etykieta: i for i, etykieta in enumerate(self.etykiety)}
+        self.liczba_usunietych = 0
+
+    def zywe_indeksy(self):
+        if self.liczba_usunietych == 0:
+            return np.arange(len(self.etykiety))
+        return np.array([i for i, etykieta in enumerate(self.etykiety) if etykieta is not None], dtype=np.int64)
+
+    def krawedzie_do_rysowania(self, maks_wierzcholkow):
+        zywe = self.zywe_indeksy()
+        if len(zywe) > maks_wierzcholkow:
+            # przy dużych grafach rysowane są tylko wierzchołki o najwyższym stopniu
+            kolejnosc = np.argsort(-self.stopnie.stopnie(zywe), kind='stable')
+            zywe = np.sort(zywe[kolejnosc[:maks_wierzcholkow]])
+        wybrane = np.zeros(self.macierz_sasiedztwa.rozmiar, dtype=bool)
+        wybrane[zywe] = True
+
+        i, j, krotnosci = self.macierz_sasiedztwa.niezerowe()
+        w_probce = wybrane[i] & wybrane[j]
+        return zywe.tolist(), i[w_probce], j[w_probce], krotnosci[w_probce]
+
+    def pokaz_lub_zapisz(self, rysuj, plik, liczba_narysowanych):
+        if plik is None:
+            figura = plt.figure()
+        else:
+            # bez pyplot - rysowanie do pliku nie wymaga wyświetlacza
+            figura = Figure(figsize=(10, 8))
+        ax = figura.add_subplot()
+        rysuj(ax)
+        if liczba_narysowanych < len(self.wierzcholki):
+            ax.set_title(f"Pokazano {liczba_narysowanych} z {len(self.wierzcholki)} wierzchołków o najwyższym stopniu")
+
+        if plik is None:
+            plt.show()
+        else:
+            figura.savefig(plik)
+
+    def wyswietl_macierz(self, wiersze=None, kolumny=None):
+        self.zapisz_macierz(sys.stdout, 'gesty', wiersze, kolumny)
+
+    def zapisz_macierz(self, plik, tryb='gesty', wiersze=None, kolumny=None):
+        if isinstance(plik, str):
+            with open(plik, 'wb' if tryb == 'npy' else 'w') as f:
+                return self.zapisz_macierz(f, tryb, wiersze, kolumny)
+        eksport.zapisz_macierz(self.macierz_sasiedztwa, self.etykiety, self.zywe_indeksy(), plik, tryb, wiersze, kolumny)
+
+    def min_max_stopien(self):
+        if not self.wierzcholki:
+            self.komunikat("Graf jest pusty.")
+            return None, None
+
+        return self.stopnie.min_max()
+
+    def parzysty_nieparzysty_stopien(self):
+        return self.stopnie.parzyste_nieparzyste()
 
-            nowe_wierzcholki = {}
-            for i, klucz in enumerate(self.wierzcholki):
-                nowe_wierzcholki[klucz] = i
-            self.wierzcholki = nowe_wierzcholki
-            print(f"Usunięto wierzchołek {etykieta}")
+    def posortowane_stopnie(self):
+        return self.stopnie.posortowane()
+
+    def macierz_bitowa(self, symetryczna=False):
+        symetryczna = symetryczna and self.skierowany
+        if symetryczna not in self._bitowe:
+            wiersze, kolumny, _ = self.macierz_sasiedztwa.niezerowe()
+            if symetryczna:
+                wiersze, kolumny = np.concatenate((wiersze, kolumny)), np.concatenate((kolumny, wiersze))
+            self._bitowe[symetryczna] = MacierzBitowa(self.macierz_sasiedztwa.rozmiar, wiersze, kolumny)
+        return self._bitowe[symetryczna]
+
+    def przeszukiwanie(self, symetryczna=False):
+        # macierz bitowa tylko dla reprezentacji gęstej - w rzadkiej (n * n bitów) byłaby większa od grafu
+        if isinstance(self.macierz_sasiedztwa, MacierzRzadka):
+            return SasiedztwoRzadkie(self.macierz_sasiedztwa, symetryczna and self.skierowany)
+        return self.macierz_bitowa(symetryczna)
+
+    def _aktualizuj_bity(self, index_u, index_v):
+        # po zmianie krotności krawędzi u -> v (w grafie nieskierowanym także v -> u)
+        for symetryczna, macierz in self._bitowe.items():
+            istnieje = self.macierz_sasiedztwa.wartosc(index_u, index_v) > 0
+            if symetryczna:
+                istnieje = istnieje or self.macierz_sasiedztwa.wartosc(index_v, index_u) > 0
+            pary = ((index_u, index_v), (index_v, index_u)) if symetryczna or not self.skierowany else ((index_u, index_v),)
+            for i, j in pary:
+                if istnieje:
+                    macierz.ustaw(i, j)
+                else:
+                    macierz.wyczysc(i, j)
 
+    def index_wierzcholka(self, etykieta):
+        try:
+            etykieta = int(etykieta)
+            if etykieta not in self.wierzcholki:
+                self.komunikat(f"Wierzchołek {etykieta} nie istnieje.")
+                return
+            return self.wierzcholki[etykieta]
         except ValueError:
-            print(f"Niepoprawny wierzchołek: {etykieta}. Musi być on liczbą całkowitą.")
+            self.komunikat(f"Niepoprawny wierzchołek: {etykieta}")
             return
 
-    def wyswietl_macierz(self):
-        naglowki = ' '.join(map(str, self.wierzcholki.keys()))
-        print(f"   {naglowki}")
+    def bfs(self, etykieta):
+        index = self.index_wierzcholka(etykieta)
+        if index is None:
+            return
+        poziomy, _ = self.przeszukiwanie().poziomy(index)
+        return [[self.etykiety[i] for i in poziom.tolist()] for poziom in poziomy]
 
-        for etykieta in self.wierzcholki.keys():
-            index = self.wierzcholki[etykieta]
-            wiersz = ' '.join(str(self.macierz_sasiedztwa[index][i]) for i in range(len(self.macierz_sasiedztwa)))
-            print(f"{etykieta} [{wiersz}]")
+    def dfs(self, etykieta):
+        index = self.index_wierzcholka(etykieta)
+        if index is None:
+            return
+        return [self.etykiety[i] for i in self.przeszukiwanie().dfs(index)]
 
+    def osiagalne(self, etykieta):
+        index = self.index_wierzcholka(etykieta)
+        if index is None:
+            return
+        macierz = self.przeszukiwanie()
+        _, odwiedzone = macierz.poziomy(index)
+        return sorted(self.etykiety[i] for i in macierz.elementy(odwiedzone).tolist())
+
+    def skladowe(self):
+        # w grafie skierowanym: składowe słabo spójne
+        zywe = self.zywe_indeksy()
+        numery = self.przeszukiwanie(symetryczna=True).skladowe(zywe)
+        skladowe = [[] for _ in range(int(numery.max()) + 1 if len(numery) else 0)]
+        for index, numer in zip(zywe.tolist(), numery.tolist()):
+            skladowe[numer].append(self.etykiety[index])
+        return skladowe
+
+    def spojny(self):
+        if not self.wierzcholki:
+            self.komunikat("Graf jest pusty.")
+            return
+        return len(self.skladowe()) == 1
+
+    def eulerowski(self):
+        zywe = self.zywe_indeksy()
+        wyj, wej = self.stopnie.wyj[zywe], self.stopnie.wej[zywe]
+        if self.skierowany:
+            roznice = wyj - wej
+            if np.all(roznice == 0):
+                rodzaj = 'cykl'
+            elif np.count_nonzero(roznice) == 2 and np.sum(roznice == 1) == 1 and np.sum(roznice == -1) == 1:
+                rodzaj = 'ścieżka'
+            else:
+                return None
+        else:
+            nieparzyste = np.count_nonzero(self.stopnie.stopnie(zywe) % 2)
+            rodzaj = {0: 'cykl', 2: 'ścieżka'}.get(nieparzyste)
+            if rodzaj is None:
+                return None
+
+        # wszystkie krawędzie muszą leżeć w jednej (słabo) spójnej składowej
+        z_krawedziami = zywe[(wyj + wej) > 0]
+        if len(z_krawedziami) == 0:
+            return rodzaj
+        macierz = self.przeszukiwanie(symetryczna=True)
+        _, odwiedzone = macierz.poziomy(int(z_krawedziami[0]))
+        if np.isin(z_krawedziami, macierz.elementy(odwiedzone)).all():
+            return rodzaj
+        return None
 
-class GrafNieskierowany(Graf):
-    def __init__(self):
-        self.macierz_sasiedztwa = []
-        self.wierzcholki = {}
 
+class GrafNieskierowany(Graf):
     def dodaj_krawedz(self, u, v):
         try:
             u = int(u)
             v = int(v)
             if u not in self.wierzcholki or v not in self.wierzcholki:
-                print(f"Nie można dodać krawędzi: jeden z wierzchołków nie istnieje.")
+                self.komunikat(f"Nie można dodać krawędzi: jeden z wierzchołków nie istnieje.")
                 return
             
             if u == v:
-                print("Nie można dodać pętli do grafu!")
+                self.komunikat("Nie można dodać pętli do grafu!")
                 return
 
             index_u = self.wierzcholki[u]
             index_v = self.wierzcholki[v]
-            self.macierz_sasiedztwa[index_u][index_v] += 1
-            self.macierz_sasiedztwa[index_v][index_u] += 1
-            print(f"Dodano krawędź do grafu nieskierowanego między {u} a {v}.")
-            self.wyswietl_macierz()
+            self.macierz_sasiedztwa.zwieksz(index_u, index_v)
+            self.macierz_sasiedztwa.zwieksz(index_v, index_u)
+            self._aktualizuj_bity(index_u, index_v)
+            self.stopnie.zmien(index_u, index_v, 1)
+            self.stopnie.zmien(index_v, index_u, 1)
+            self.komunikat(f"Dodano krawędź do grafu nieskierowanego między {u} a {v}.")
+            if not self.cichy:
+                self.wyswietl_macierz()
+            return True
         except ValueError:
-            print(f"Niepoprawne wierzchołki: {u}, {v}")
+            self.komunikat(f"Niepoprawne wierzchołki: {u}, {v}")
             return   
+        except OverflowError as e:
+            self.komunikat(f"Nie można dodać krawędzi: {e}")
+            return
 
     def usun_krawedz(self, u, v):
         try:
             u = int(u)
             v = int(v)
             if u not in self.wierzcholki or v not in self.wierzcholki:
-                print(f"Nie można usunąć krawędzi: jeden z wierzchołków nie istnieje.")
+                self.komunikat(f"Nie można usunąć krawędzi: jeden z wierzchołków nie istnieje.")
                 return
 
             index_u = self.wierzcholki[u]
             index_v = self.wierzcholki[v]
 
-            if self.macierz_sasiedztwa[index_u][index_v] == 0 and self.macierz_sasiedztwa[index_v][index_u] == 0:
-                print(f"Krawędź między {u} a {v} nie istnieje.")
+            if self.macierz_sasiedztwa.wartosc(index_u, index_v) == 0:
+                self.komunikat(f"Krawędź między {u} a {v} nie istnieje.")
                 return
     
-            if self.macierz_sasiedztwa[index_u][index_v] < 2 and self.macierz_sasiedztwa[index_v][index_u] < 2:
-                self.macierz_sasiedztwa[index_u][index_v] = 0
-                self.macierz_sasiedztwa[index_v][index_u] = 0
-            else: 
-                self.macierz_sasiedztwa[index_u][index_v] -= 1
-                self.macierz_sasiedztwa[index_v][index_u] -= 1
-            print(f"Usunięto krawędź grafu nieskierowanego między {u} a {v}.")
-            self.wyswietl_macierz()
+            self.macierz_sasiedztwa.zmniejsz(index_u, index_v)
+            self.macierz_sasiedztwa.zmniejsz(index_v, index_u)
+            self._aktualizuj_bity(index_u, index_v)
+            self.stopnie.zmien(index_u, index_v, -1)
+            self.stopnie.zmien(index_v, index_u, -1)
+            self.komunikat(f"Usunięto krawędź grafu nieskierowanego między {u} a {v}.")
+            if not self.cichy:
+                self.wyswietl_macierz()
+            return True
         except ValueError:
-            print(f"Niepoprawne wierzchołki: {u}, {v}")
+            self.komunikat(f"Niepoprawne wierzchołki: {u}, {v}")
             return
 
     def stopien_wierzcholka(self, etykieta):
         try:
             etykieta = int(etykieta)
             if etykieta not in self.wierzcholki:
-                print(f"Wierzchołek {etykieta} nie istnieje.")
+                self.komunikat(f"Wierzchołek {etykieta} nie istnieje.")
                 return 
 
             index = self.wierzcholki[etykieta]
-            stopien = sum(self.macierz_sasiedztwa[index])
+            stopien = self.stopnie.stopien(index)
             return stopien 
         except ValueError:
-            print(f"Niepoprawny wierzchołek: {etykieta}")
+            self.komunikat(f"Niepoprawny wierzchołek: {etykieta}")
             return
 
-    def min_max_stopien(self):
-        if not self.wierzcholki:
-            print("Graf jest pusty.")
-            return None, None
-    
-        stopnie = [sum(self.macierz_sasiedztwa[i]) for i in range(len(self.macierz_sasiedztwa))]
-        min_stopien = min(stopnie)
-        max_stopien = max(stopnie)
-        return min_stopien, max_stopien
-
-    def parzysty_nieparzysty_stopien(self):
-        liczba_parzystych = 0
-        liczba_nieparzystych = 0
-        for etykieta in self.wierzcholki.keys():
-            stopien = self.stopien_wierzcholka(etykieta)
-            if stopien % 2 == 0:
-                liczba_parzystych += 1
-            else:
-                liczba_nieparzystych += 1
-
-        return liczba_parzystych, liczba_nieparzystych
-    
-    def posortowane_stopnie(self):
-        stopnie = []
-        for etykieta in self.wierzcholki.keys():
-            stopien = self.stopien_wierzcholka(etykieta)
-            stopnie.append(stopien)
+    def narysuj_graf(self, plik=None, maks_wierzcholkow=MAKS_WIERZCHOLKOW_RYSUNKU):
+        wybrane, i, j, krotnosci = self.krawedzie_do_rysowania(maks_wierzcholkow)
+        gorny_trojkat = i < j
+        etykiety = self.etykiety
 
-        stopnie.sort(reverse=True)
-        return stopnie
+        G = nx.Graph()
+        G.add_nodes_from(etykiety[w] for w in wybrane)
+        G.add_weighted_edges_from(zip((etykiety[w] for w in i[gorny_trojkat].tolist()),
+                                      (etykiety[w] for w in j[gorny_trojkat].tolist()),
+                                      krotnosci[gorny_trojkat].tolist()))
 
+        def rysuj(ax):
+            pos = nx.spring_layout(G)
+            edge_labels = nx.get_edge_attributes(G, 'weight')
 
-    def narysuj_graf(self):
-        G = nx.MultiGraph()
+            nx.draw(G, pos, ax=ax, with_labels=True, arrows=False, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray')
+            nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=edge_labels)
 
-        for etykieta in self.wierzcholki.keys():
-            G.add_node(etykieta)
-
-        for i in range(len(self.macierz_sasiedztwa)):
-            for j in range(len(self.macierz_sasiedztwa)):
-                for _ in range(self.macierz_sasiedztwa[i][j]):
-                    if self.macierz_sasiedztwa[i][j] > 0:
-                        G.add_edge(list(self.wierzcholki.keys())[i], list(self.wierzcholki.keys())[j])
-
-        pos = nx.spring_layout(G)
-        edge_labels = {(u, v): int(G.number_of_edges(u, v)/2) for u, v in G.edges()}
-
-        nx.draw(G, pos, with_labels=True, arrows=False, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
-        plt.show()
+        self.pokaz_lub_zapisz(rysuj, plik, len(wybrane))
 
 
 class GrafSkierowany(Graf):
-    def __init__(self):
-        self.macierz_sasiedztwa = []
-        self.wierzcholki = {}
-    
+    skierowany = True
+
     def dodaj_krawedz(self, u, v):
         try:
             u = int(u)
             v = int(v)
             if u not in self.wierzcholki or v not in self.wierzcholki:
-                print(f"Nie można dodać krawędzi: jeden z wierzchołków nie istnieje.")
+                self.komunikat(f"Nie można dodać krawędzi: jeden z wierzchołków nie istnieje.")
                 return
             
             if u == v:
-                print("Nie można dodać pętli do grafu!")
+                self.komunikat("Nie można dodać pętli do grafu!")
                 return
 
             index_u = self.wierzcholki[u]
             index_v = self.wierzcholki[v]
-            self.macierz_sasiedztwa[index_u][index_v] += 1
-            print(f"Dodano krawędź do grafu skierowanego od {u} do {v}.")
-            self.wyswietl_macierz()
+            self.macierz_sasiedztwa.zwieksz(index_u, index_v)
+            self._aktualizuj_bity(index_u, index_v)
+            self.stopnie.zmien(index_u, index_v, 1)
+            self.komunikat(f"Dodano krawędź do grafu skierowanego od {u} do {v}.")
+            if not self.cichy:
+                self.wyswietl_macierz()
+            return True
         except ValueError:
-            print(f"Niepoprawne wierzchołki: {u}, {v}")
+            self.komunikat(f"Niepoprawne wierzchołki: {u}, {v}")
+            return
+        except OverflowError as e:
+            self.komunikat(f"Nie można dodać krawędzi: {e}")
             return
 
     def usun_krawedz(self, u, v):
@@ -210,77 +444,106 @@ class GrafSkierowany(Graf):
             u = int(u)
             v = int(v)
             if u not in self.wierzcholki or v not in self.wierzcholki:
-                print(f"Nie można usunąć krawędzi: jeden z wierzchołków nie istnieje.")
+                self.komunikat(f"Nie można usunąć krawędzi: jeden z wierzchołków nie istnieje.")
                 return
 
             index_u = self.wierzcholki[u]
             index_v = self.wierzcholki[v]
 
-            if self.macierz_sasiedztwa[index_u][index_v] == 0:
-                print(f"Krawędź od {u} do {v} nie istnieje.")
+            if self.macierz_sasiedztwa.wartosc(index_u, index_v) == 0:
+                self.komunikat(f"Krawędź od {u} do {v} nie istnieje.")
                 return
     
-            if self.macierz_sasiedztwa[index_u][index_v] < 2:
-                self.macierz_sasiedztwa[index_u][index_v] = 0
-            else:
-                self.macierz_sasiedztwa[index_u][index_v] -= 1
-            print(f"Usunięto krawędź grafu skierowanego od {u} do {v}.")
-            self.wyswietl_macierz()
+            self.macierz_sasiedztwa.zmniejsz(index_u, index_v)
+            self._aktualizuj_bity(index_u, index_v)
+            self.stopnie.zmien(index_u, index_v, -1)
+            self.komunikat(f"Usunięto krawędź grafu skierowanego od {u} do {v}.")
+            if not self.cichy:
+                self.wyswietl_macierz()
+            return True
         except ValueError:
-            print(f"Niepoprawne wierzchołki: {u}, {v}")
+            self.komunikat(f"Niepoprawne wierzchołki: {u}, {v}")
             return
 
     def stopien_wierzcholka(self, etykieta):
         try:
             etykieta = int(etykieta)
             if etykieta not in self.wierzcholki:
-                print(f"Wierzchołek {etykieta} nie istnieje.")
+                self.komunikat(f"Wierzchołek {etykieta} nie istnieje.")
                 return None, None
 
             index = self.wierzcholki[etykieta]
-            stopien_wychodzacy = sum(self.macierz_sasiedztwa[index])
-            stopien_wchodzacy = sum(self.macierz_sasiedztwa[i][index] for i in range(len(self.macierz_sasiedztwa)))
+            stopien_wychodzacy = int(self.stopnie.wyj[index])
+            stopien_wchodzacy = int(self.stopnie.wej[index])
             return stopien_wchodzacy, stopien_wychodzacy
         
         except ValueError:
-            print(f"Niepoprawny wierzchołek: {etykieta}")
+            self.komunikat(f"Niepoprawny wierzchołek: {etykieta}")
             return None, None
     
-    def narysuj_graf(self):
+    def narysuj_graf(self, plik=None, maks_wierzcholkow=MAKS_WIERZCHOLKOW_RYSUNKU):
+        wybrane, i, j, krotnosci = self.krawedzie_do_rysowania(maks_wierzcholkow)
+        etykiety = self.etykiety
+
         G = nx.MultiDiGraph()
+        G.add_nodes_from(etykiety[w] for w in wybrane)
+        G.add_edges_from(zip((etykiety[w] for w in np.repeat(i, krotnosci).tolist()),
+                             (etykiety[w] for w in np.repeat(j, krotnosci).tolist())))
 
-        for etykieta in self.wierzcholki.keys():
-            G.add_node(etykieta)
+        def rysuj(ax):
+            pos = nx.spring_layout(G)
 
-        for i in range(len(self.macierz_sasiedztwa)):
-            for j in range(len(self.macierz_sasiedztwa)):
-                liczba_krawedzi = self.macierz_sasiedztwa[i][j]
-                if liczba_krawedzi > 0:
-                    for _ in range(liczba_krawedzi):
-                        G.add_edge(list(self.wierzcholki.keys())[i], list(self.wierzcholki.keys())[j])
+            connectionstyle = [f"arc3,rad={r}" for r in it.accumulate([0.15] * 4)]
+            nx.draw(G, pos, ax=ax, with_labels=True, connectionstyle=connectionstyle, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray', arrows=True, arrowstyle='->', arrowsize=20)
+
+        self.pokaz_lub_zapisz(rysuj, plik, len(wybrane))
+
+def pokaz_skladowe(graf):
+    skladowe = graf.skladowe()
+    print(f"Liczba składowych: {len(skladowe)}" + (" (graf spójny)" if len(skladowe) == 1 else ""))
+    for numer, skladowa in enumerate(skladowe, start=1):
+        print(f"Składowa {numer}: {skladowa}")
+
+
+def pokaz_przeszukiwanie(graf, v):
+    poziomy = graf.bfs(v)
+    if poziomy is None:
+        return
+    for odleglosc, poziom in enumerate(poziomy):
+        print(f"BFS, odległość {odleglosc}: {poziom}")
+    print(f"Kolejność DFS: {graf.dfs(v)}")
+
+
+def pokaz_euler(graf):
+    rodzaj = graf.eulerowski()
+    if rodzaj is None:
+        print("Graf nie posiada cyklu ani ścieżki Eulera.")
+    else:
+        print(f"Graf posiada {'cykl' if rodzaj == 'cykl' else 'ścieżkę'} Eulera.")
 
-        pos = nx.spring_layout(G)
 
-        connectionstyle = [f"arc3,rad={r}" for r in it.accumulate([0.15] * 4)]
-        nx.draw(G, pos, with_labels=True, connectionstyle=connectionstyle, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray', arrows=True, arrowstyle='->', arrowsize=20)
-        plt.show()
-        
 def main():
     file_name = "krawedzie.txt"
+    reprezentacja = 'rzadka' if "--rzadka" in sys.argv else 'gesta'
     if len(sys.argv) > 1:
         if sys.argv[1] == "-s":
-            graf_skierowany = GrafSkierowany()
             try:
-                with open(file_name, 'r') as file:
-                    for line in file:
-                        current = line.strip().split(', ')
-                        i = int(current[0])
-                        j = int(current[1])
-                        graf_skierowany.dodaj_wierzcholek(i)
-                        graf_skierowany.dodaj_wierzcholek(j)
-                        graf_skierowany.dodaj_krawedz(i, j)
-            except FileNotFoundError:
-                print(f"Plik '{file_name}' nie istnieje. Utworzono nowy, pusty graf.")
+                if "--sesja" in sys.argv:
+                    sesja = Sesja.otworz(GrafSkierowany, "graf_skierowany", file_name, reprezentacja=reprezentacja)
+                    graf_skierowany = sesja.graf
+                    print(f"Wczytano sesję 'graf_skierowany' ({len(graf_skierowany.wierzcholki)} wierzchołków).")
+                else:
+                    try:
+                        graf_skierowany = GrafSkierowany.z_pliku(file_name, reprezentacja=reprezentacja)
+                        print(f"Wczytano graf z pliku '{file_name}' ({len(graf_skierowany.wierzcholki)} wierzchołków).")
+                    except FileNotFoundError:
+                        graf_skierowany = GrafSkierowany(reprezentacja=reprezentacja)
+                        print(f"Plik '{file_name}' nie istnieje. Utworzono nowy, pusty graf.")
+                    sesja = Sesja(graf_skierowany)
+            except OverflowError as e:
+                # krotność krawędzi z pliku nie mieści się w typie macierzy (domyślnie uint8)
+                print(f"Nie można wczytać grafu z pliku '{file_name}': {e}")
+                return
 
             while True:
                 print()
@@ -291,22 +554,25 @@ def main():
                 print("5. stopień wierzchołka (stopień wchodzący i wychodzący)")
                 print("6. narysowanie grafu")
                 print("7. wyświetlenie macierzy sąsiedztwa")
-                print("8. zakończ program")
+                print("8. składowe słabo spójne")
+                print("9. przeszukiwanie BFS / DFS i wierzchołki osiągalne")
+                print("10. cykl / ścieżka Eulera")
+                print("11. zakończ program")
                 opcja = input("Wybierz opcję: ")
                 if (opcja == '1'):
                     u = input("Podaj pierwszy wierzchołek: ")
                     v = input("Podaj drugi wierzchołek: ")
-                    graf_skierowany.dodaj_krawedz(u, v)
+                    sesja.wykonaj('dodaj_krawedz', u, v)
                 elif opcja == '2':
                     u = input("Podaj pierwszy wierzchołek: ")
                     v = input("Podaj drugi wierzchołek: ")
-                    graf_skierowany.usun_krawedz(u, v)
+                    sesja.wykonaj('usun_krawedz', u, v)
                 elif opcja == '3':
                     v = input("Podaj wierzchołek: ")
-                    graf_skierowany.dodaj_wierzcholek(v)
+                    sesja.wykonaj('dodaj_wierzcholek', v)
                 elif opcja == '4':
                     v = input("Podaj wierzchołek: ")
-                    graf_skierowany.usun_wierzcholek(v)
+                    sesja.wykonaj('usun_wierzcholek', v)
                 elif opcja == '5':
                     v = input("Podaj wierzchołek: ")
                     wchodzacy, wychodzacy = graf_skierowany.stopien_wierzcholka(v)
@@ -316,23 +582,39 @@ def main():
                 elif opcja == '7':
                     graf_skierowany.wyswietl_macierz()
                 elif opcja == '8':
-                    break    
+                    pokaz_skladowe(graf_skierowany)
+                elif opcja == '9':
+                    v = input("Podaj wierzchołek: ")
+                    pokaz_przeszukiwanie(graf_skierowany, v)
+                    osiagalne = graf_skierowany.osiagalne(v)
+                    if osiagalne is not None:
+                        print(f"Wierzchołki osiągalne: {osiagalne}")
+                elif opcja == '10':
+                    pokaz_euler(graf_skierowany)
+                elif opcja == '11':
+                    sesja.zamknij()
+                    break
                 else:
                     print("Nieprawidłowa opcja!")
             
         elif sys.argv[1] == "-n":
-            graf_nieskierowany = GrafNieskierowany()
             try:
-                with open(file_name, 'r') as file:
-                    for line in file:
-                        current = line.strip().split(', ')
-                        i = int(current[0])
-                        j = int(current[1])
-                        graf_nieskierowany.dodaj_wierzcholek(i)
-                        graf_nieskierowany.dodaj_wierzcholek(j)
-                        graf_nieskierowany.dodaj_krawedz(i, j)
-            except FileNotFoundError:
-                print(f"Plik '{file_name}' nie istnieje. Utworzono nowy, pusty graf.")
+                if "--sesja" in sys.argv:
+                    sesja = Sesja.otworz(GrafNieskierowany, "graf_nieskierowany", file_name, reprezentacja=reprezentacja)
+                    graf_nieskierowany = sesja.graf
+                    print(f"Wczytano sesję 'graf_nieskierowany' ({len(graf_nieskierowany.wierzcholki)} wierzchołków).")
+                else:
+                    try:
+                        graf_nieskierowany = GrafNieskierowany.z_pliku(file_name, reprezentacja=reprezentacja)
+                        print(f"Wczytano graf z pliku '{file_name}' ({len(graf_nieskierowany.wierzcholki)} wierzchołków).")
+                    except FileNotFoundError:
+                        graf_nieskierowany = GrafNieskierowany(reprezentacja=reprezentacja)
+                        print(f"Plik '{file_name}' nie istnieje. Utworzono nowy, pusty graf.")
+                    sesja = Sesja(graf_nieskierowany)
+            except OverflowError as e:
+                # krotność krawędzi z pliku nie mieści się w typie macierzy (domyślnie uint8)
+                print(f"Nie można wczytać grafu z pliku '{file_name}': {e}")
+                return
 
             while True:
                 print()
@@ -346,22 +628,25 @@ def main():
                 print("8. posortowane stopnie wierzchołków")
                 print("9. narysowanie grafu")
                 print("10. wyświetlenie macierzy sąsiedztwa")
-                print("11. zakończ program")
+                print("11. spójność i składowe spójne")
+                print("12. przeszukiwanie BFS / DFS")
+                print("13. cykl / ścieżka Eulera")
+                print("14. zakończ program")
                 opcja = input("Wybierz opcję: ")
                 if (opcja == '1'):
                     u = input("Podaj pierwszy wierzchołek: ")
                     v = input("Podaj drugi wierzchołek: ")
-                    graf_nieskierowany.dodaj_krawedz(u, v)
+                    sesja.wykonaj('dodaj_krawedz', u, v)
                 elif opcja == '2':
                     u = input("Podaj pierwszy wierzchołek: ")
                     v = input("Podaj drugi wierzchołek: ")
-                    graf_nieskierowany.usun_krawedz(u, v)
+                    sesja.wykonaj('usun_krawedz', u, v)
                 elif opcja == '3':
                     v = input("Podaj wierzchołek: ")
-                    graf_nieskierowany.dodaj_wierzcholek(v)
+                    sesja.wykonaj('dodaj_wierzcholek', v)
                 elif opcja == '4':
                     v = input("Podaj wierzchołek: ")
-                    graf_nieskierowany.usun_wierzcholek(v)
+                    sesja.wykonaj('usun_wierzcholek', v)
                 elif opcja == '5':
                     v = input("Podaj wierzchołek: ")
                     stopien = graf_nieskierowany.stopien_wierzcholka(v)
@@ -384,7 +669,15 @@ def main():
                 elif opcja == '10':
                     graf_nieskierowany.wyswietl_macierz()
                 elif opcja == '11':
-                    break    
+                    pokaz_skladowe(graf_nieskierowany)
+                elif opcja == '12':
+                    v = input("Podaj wierzchołek: ")
+                    pokaz_przeszukiwanie(graf_nieskierowany, v)
+                elif opcja == '13':
+                    pokaz_euler(graf_nieskierowany)
+                elif opcja == '14':
+                    sesja.zamknij()
+                    break
                 else:
                     print("Nieprawidłowa opcja!")
         else:
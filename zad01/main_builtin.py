@@ -4,15 +4,163 @@ import sys
 import numpy as np
 import itertools as it
 
+class LicznikKrawedzi:
+    # Zamiennik nx.MultiGraph / nx.MultiDiGraph przechowujący dla każdej pary wierzchołków tylko liczbę krawędzi
+    # (zamiast osobnego słownika atrybutów dla każdej krawędzi wielokrotnej).
+    def __init__(self, skierowany):
+        self.skierowany = skierowany
+        self.wyjscia = {}
+        self.wejscia = {} if skierowany else self.wyjscia
+        self.stopnie_wyj = {}
+        self.stopnie_wej = {} if skierowany else self.stopnie_wyj
+
+    def __len__(self):
+        return len(self.wyjscia)
+
+    def nodes(self):
+        return self.wyjscia.keys()
+
+    def has_node(self, v):
+        return v in self.wyjscia
+
+    def add_node(self, v):
+        if v not in self.wyjscia:
+            self.wyjscia[v] = {}
+            self.wejscia[v] = {}
+            self.stopnie_wyj[v] = 0
+            self.stopnie_wej[v] = 0
+
+    def remove_node(self, v):
+        for w, krotnosc in self.wyjscia[v].items():
+            if w != v:
+                del self.wejscia[w][v]
+                self.stopnie_wej[w] -= krotnosc
+        if self.skierowany:
+            for w, krotnosc in self.wejscia[v].items():
+                if w != v:
+                    del self.wyjscia[w][v]
+                    self.stopnie_wyj[w] -= krotnosc
+            del self.wejscia[v]
+            del self.stopnie_wej[v]
+        del self.wyjscia[v]
+        del self.stopnie_wyj[v]
+
+    def has_edge(self, u, v):
+        return u in self.wyjscia and v in self.wyjscia[u]
+
+    def number_of_edges(self, u, v):
+        return self.wyjscia.get(u, {}).get(v, 0)
+
+    def add_edge(self, u, v):
+        self.add_node(u)
+        self.add_node(v)
+        krotnosc = self.wyjscia[u].get(v, 0) + 1
+        self.wyjscia[u][v] = krotnosc
+        self.wejscia[v][u] = krotnosc
+        self.stopnie_wyj[u] += 1
+        self.stopnie_wej[v] += 1
+
+    def remove_edge(self, u, v):
+        krotnosc = self.wyjscia[u][v] - 1
+        if krotnosc == 0:
+            del self.wyjscia[u][v]
+            self.wejscia[v].pop(u, None)
+        else:
+            self.wyjscia[u][v] = krotnosc
+            self.wejscia[v][u] = krotnosc
+        self.stopnie_wyj[u] -= 1
+        self.stopnie_wej[v] -= 1
+
+    def in_degree(self, v):
+        return self.stopnie_wej[v]
+
+    def out_degree(self, v):
+        return self.stopnie_wyj[v]
+
+    def is_directed(self):
+        return self.skierowany
+
+    def degree(self, v=None):
+        if v is not None:
+            if self.skierowany:
+                return self.stopnie_wej[v] + self.stopnie_wyj[v]
+            return self.stopnie_wyj[v]
+        return [(w, self.degree(w)) for w in self.wyjscia]
+
+    def krawedzie(self):
+        for u, sasiedzi in self.wyjscia.items():
+            for v, krotnosc in sasiedzi.items():
+                if self.skierowany or u <= v:
+                    yield u, v, krotnosc
+
+    def do_networkx(self):
+        graf = nx.MultiDiGraph() if self.skierowany else nx.MultiGraph()
+        graf.add_nodes_from(self.wyjscia)
+        graf.add_edges_from((u, v) for u, v, krotnosc in self.krawedzie() for _ in range(krotnosc))
+        return graf
+
+
 class Graf:
     def __init__(self):
         self.graph = None 
 
+    def graf_networkx(self):
+        if isinstance(self.graph, LicznikKrawedzi):
+            return self.graph.do_networkx()
+        return self.graph
+
+    def tablice_krawedzi(self):
+        # etykiety wierzchołków są liczbami całkowitymi (int(v) w dodaj_wierzcholek), więc zamiana etykiet
+        # sąsiadów na indeksy wierszy to odczyt z tablicy (etykiety niewielkie) albo wyszukiwanie binarne
+        etykiety = np.fromiter(self.graph.nodes(), dtype=np.int64, count=len(self.graph))
+        kompaktowy = isinstance(self.graph, LicznikKrawedzi)
+        sasiedztwo = self.graph.wyjscia if kompaktowy else self.graph.adj
+        slowniki = list(sasiedztwo.values())
+
+        dlugosci = np.fromiter(map(len, slowniki), dtype=np.int64, count=len(slowniki))
+        liczba = int(dlugosci.sum())
+        sasiedzi = np.fromiter(it.chain.from_iterable(slowniki), dtype=np.int64, count=liczba)
+        krotnosci = it.chain.from_iterable(s.values() for s in slowniki)
+        krotnosci = np.fromiter(krotnosci if kompaktowy else map(len, krotnosci), dtype=np.int64, count=liczba)
+
+        n = len(etykiety)
+        if n and etykiety.min() >= 0 and etykiety.max() < 4 * n:
+            indeks_etykiety = np.empty(etykiety.max() + 1, dtype=np.int64)
+            indeks_etykiety[etykiety] = np.arange(n)
+            kolumny = indeks_etykiety[sasiedzi]
+        else:
+            kolejnosc = np.argsort(etykiety)
+            kolumny = kolejnosc[np.searchsorted(etykiety[kolejnosc], sasiedzi)]
+        wiersze = np.repeat(np.arange(n, dtype=np.int64), dlugosci)
+        if not self.graph.is_directed():
+            # pętla w grafie nieskierowanym zwiększa stopień o 2
+            krotnosci[wiersze == kolumny] *= 2
+        return wiersze, kolumny, krotnosci, dict(zip(etykiety.tolist(), range(n)))
+
+    def macierz_sasiedztwa(self, format='gesta'):
+        wiersze, kolumny, krotnosci, indeksy = self.tablice_krawedzi()
+        n = len(indeksy)
+        if format == 'gesta':
+            macierz = np.zeros((n, n), dtype=np.int64)
+            np.add.at(macierz, (wiersze, kolumny), krotnosci)
+            return macierz, indeksy
+
+        kolejnosc = np.argsort(wiersze * n + kolumny)
+        wiersze, kolumny, krotnosci = wiersze[kolejnosc], kolumny[kolejnosc], krotnosci[kolejnosc]
+        if format == 'coo':
+            return (wiersze, kolumny, krotnosci), indeksy
+        if format == 'csr':
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(wiersze, minlength=n), out=indptr[1:])
+            return (indptr, kolumny, krotnosci), indeksy
+        raise ValueError(f"Nieznany format macierzy: {format}")
+
     def dodaj_wierzcholek(self, v):
         try:
             v = int(v)
             if not self.graph.has_node(v):
                 self.graph.add_node(v)
+                return True
             else:
                 print(f"Wierzchołek {v} już istnieje.")
                 return
@@ -27,6 +175,7 @@ class Graf:
                 print(f"Wierzchołek {v} nie istnieje")
                 return
             self.graph.remove_node(v)
+            return True
         except ValueError:
             print(f"Nie poprawny wierzchołek: {v}")
             return
@@ -39,6 +188,7 @@ class Graf:
                 print(f"Któryś z wierzchołków nie istnieje.")
                 return
             self.graph.add_edge(u, v)
+            return True
         except ValueError:
             print(f"Niepoprawne wierzchołki: {u}, {v}")
             return
@@ -51,14 +201,15 @@ class Graf:
                 print(f"Podana krawędź nie istnieje.")
                 return
             self.graph.remove_edge(u, v)
+            return True
         except ValueError:
             print(f"Nie poprawne wierzchołki: {u}, {v}")
             return   
 
 
 class GrafNieskierowany(Graf):
-    def __init__(self):
-        self.graph = nx.MultiGraph()
+    def __init__(self, kompaktowy=False):
+        self.graph = LicznikKrawedzi(skierowany=False) if kompaktowy else nx.MultiGraph()
 
     def stopien_wierzcholka(self, v):
         try:
@@ -102,30 +253,19 @@ class GrafNieskierowany(Graf):
         return sorted(stopnie, key=lambda x: x, reverse=True)
 
     def narysuj_graf(self):
-        pos = nx.spring_layout(self.graph)
-        edge_labels = {(u, v): len(self.graph[u][v]) for u, v in self.graph.edges()}
+        graf = self.graf_networkx()
+        pos = nx.spring_layout(graf)
+        edge_labels = {(u, v): len(graf[u][v]) for u, v in graf.edges()}
     
-        nx.draw(self.graph, pos, with_labels=True, arrows=False, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray')
-        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels)
+        nx.draw(graf, pos, with_labels=True, arrows=False, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray')
+        nx.draw_networkx_edge_labels(graf, pos, edge_labels=edge_labels)
         plt.show()
         
 
-    def macierz_sasiedztwa(self):
-        liczba_wierzcholkow = len(self.graph.nodes())
-        macierz = np.zeros((liczba_wierzcholkow, liczba_wierzcholkow), dtype=int)
-
-        for krawedz in self.graph.edges(data=True):
-            i = krawedz[0]
-            j = krawedz[1]
-            macierz[i][j] += 1
-            macierz[j][i] += 1
-
-        return macierz
-
 
 class GrafSkierowany(Graf):
-    def __init__(self):
-        self.graph = nx.MultiDiGraph()
+    def __init__(self, kompaktowy=False):
+        self.graph = LicznikKrawedzi(skierowany=True) if kompaktowy else nx.MultiDiGraph()
     
     def stopnie_wierzcholkow_graf_skierowany(self,v):
         try:
@@ -141,28 +281,18 @@ class GrafSkierowany(Graf):
             return None, None
     
     def narysuj_graf(self):
-        pos = nx.spring_layout(self.graph)
+        graf = self.graf_networkx()
+        pos = nx.spring_layout(graf)
         connectionstyle = [f"arc3,rad={r}" for r in it.accumulate([0.15] * 4)]
-        nx.draw(self.graph, pos, with_labels=True, connectionstyle=connectionstyle, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray', arrows=True, arrowstyle='->', arrowsize=20)
+        nx.draw(graf, pos, with_labels=True, connectionstyle=connectionstyle, node_color='skyblue', node_size=700, font_size=20, font_color='black', edge_color='gray', arrows=True, arrowstyle='->', arrowsize=20)
         plt.show()
 
-    def macierz_sasiedztwa(self):
-        liczba_wierzcholkow = len(self.graph.nodes())
-        macierz = np.zeros((liczba_wierzcholkow, liczba_wierzcholkow), dtype=int)
-
-        for krawedz in self.graph.edges(data=True):
-            i = krawedz[0]
-            j = krawedz[1]        
-            macierz[i][j] += 1
-    
-        return macierz
-
-
 def main():
     file_name = "krawedzie.txt"
+    kompaktowy = "--kompaktowy" in sys.argv
     if len(sys.argv) > 1:
         if sys.argv[1] == "-s":
-            graf_skierowany = GrafSkierowany()
+            graf_skierowany = GrafSkierowany(kompaktowy)
             try:
                 with open(file_name, 'r') as file:
                     for line in file:
@@ -207,8 +337,8 @@ def main():
                 elif opcja == '6':
                     graf_skierowany.narysuj_graf()
                 elif opcja == '7':
-                    macierz = graf_skierowany.macierz_sasiedztwa()
-                    print("Macierz sąsiedztwa:")
+                    macierz, indeksy = graf_skierowany.macierz_sasiedztwa()
+                    print("Macierz sąsiedztwa (kolejność wierzchołków: " + ", ".join(map(str, indeksy)) + "):")
                     for row in macierz:
                         print(row)
                 elif opcja == '8':
@@ -217,7 +347,7 @@ def main():
                     print("Nieprawidłowa opcja!")
             
         elif sys.argv[1] == "-n":
-            graf_nieskierowany = GrafNieskierowany()
+            graf_nieskierowany = GrafNieskierowany(kompaktowy)
             try:
                 with open(file_name, 'r') as file:
                     for line in file:
@@ -275,8 +405,8 @@ def main():
                 elif opcja == '9':
                     graf_nieskierowany.narysuj_graf()
                 elif opcja == '10':
-                    macierz = graf_nieskierowany.macierz_sasiedztwa()
-                    print("Macierz sąsiedztwa:")
+                    macierz, indeksy = graf_nieskierowany.macierz_sasiedztwa()
+                    print("Macierz sąsiedztwa (kolejność wierzchołków: " + ", ".join(map(str, indeksy)) + "):")
                     for row in macierz:
                         print(row)
                 elif opcja == '11':
@@ -0,0 +1,87 @@
+"""
+Przeszukiwanie grafu w reprezentacji rzadkiej bez budowania macierzy bitowej.
+
+Macierz bitowa zajmuje n * n / 8 bajtów, więc dla rzadkich grafów o setkach tysięcy wierzchołków
+byłaby wielokrotnie większa od samego grafu. Tutaj BFS przetwarza front poziom po poziomie,
+a DFS i składowe przechodzą bezpośrednio po słownikach sąsiedztwa MacierzRzadka (wiersze i kolumny),
+więc dodatkowa pamięć to O(n) niezależnie od liczby krawędzi.
+Interfejs (poziomy, elementy, dfs, skladowe) i kolejność wyników są takie same jak w MacierzBitowa:
+wierzchołki poziomu BFS są posortowane, a DFS wybiera najmniejszego nieodwiedzonego sąsiada.
+"""
+
+import numpy as np
+
+
+class SasiedztwoRzadkie:
+    def __init__(self, macierz, symetryczna=False):
+        # symetryczna: krawędzie traktowane jako nieskierowane (dla grafu skierowanego - słaba spójność)
+        self.macierz = macierz
+        self.symetryczna = symetryczna
+        self.n = macierz.rozmiar
+
+    def sasiedzi(self, index):
+        if self.symetryczna:
+            return self.macierz.wiersze[index].keys() | self.macierz.kolumny[index].keys()
+        return self.macierz.wiersze[index].keys()
+
+    def elementy(self, odwiedzone):
+        return np.flatnonzero(np.frombuffer(odwiedzone, dtype=np.uint8))
+
+    def poziomy(self, start):
+        # bytearray zamiast tablicy numpy: pojedyncze odczyty w pętli są kilka razy szybsze
+        odwiedzone = bytearray(self.n)
+        odwiedzone[start] = 1
+        front = [start]
+        poziomy = [np.array([start], dtype=np.int64)]
+        while True:
+            nastepny = []
+            for u in front:
+                for v in self.sasiedzi(u):
+                    if not odwiedzone[v]:
+                        odwiedzone[v] = 1
+                        nastepny.append(v)
+            if not nastepny:
+                return poziomy, odwiedzone
+            front = nastepny
+            poziomy.append(np.sort(np.array(nastepny, dtype=np.int64)))
+
+    def dfs(self, start):
+        odwiedzone = bytearray(self.n)
+        odwiedzone[start] = 1
+        kolejnosc = [start]
+        stos = [(start, iter(sorted(self.sasiedzi(start))))]
+        while stos:
+            _, sasiedzi = stos[-1]
+            for v in sasiedzi:
+                if not odwiedzone[v]:
+                    odwiedzone[v] = 1
+                    kolejnosc.append(v)
+                    stos.append((v, iter(sorted(self.sasiedzi(v)))))
+                    break
+            else:
+                stos.pop()
+        return kolejnosc
+
+    def skladowe(self, indeksy):
+        # jedna tablica numerów służy też za zbiór odwiedzonych, więc całość kosztuje O(n + m)
+        numery = [-1] * self.n
+        dozwolone = bytearray(self.n)
+        indeksy = np.asarray(indeksy, dtype=np.int64).tolist()
+        for index in indeksy:
+            dozwolone[index] = 1
+        numer = 0
+        for start in indeksy:
+            if numery[start] != -1:
+                continue
+            numery[start] = numer
+            front = [start]
+            while front:
+                nastepny = []
+                for u in front:
+                    for v in self.sasiedzi(u):
+                        if dozwolone[v] and numery[v] == -1:
+                            numery[v] = numer
+                            nastepny.append(v)
+                front = nastepny
+            numer += 1
+        return np.array([numery[index] for index in indeksy], dtype=np.int64)
@@ -0,0 +1,149 @@
+import numpy as np
+
+
+class IndeksStopni:
+    def __init__(self, skierowany, pojemnosc=16):
+        self.skierowany = skierowany
+        self.wej = np.zeros(pojemnosc, dtype=np.int64)
+        self.wyj = np.zeros(pojemnosc, dtype=np.int64)
+        self.rozmiar = 0
+        self.liczba_wierzcholkow = 0
+        self.histogram = {}
+        self.nieparzyste = 0
+        self._min = None
+        self._max = None
+
+    def stopien(self, index):
+        if self.skierowany:
+            return int(self.wej[index] + self.wyj[index])
+        return int(self.wyj[index])
+
+    def stopnie(self, zywe):
+        if self.skierowany:
+            return self.wej[zywe] + self.wyj[zywe]
+        return self.wyj[zywe]
+
+    def _dodaj_stopien(self, stopien):
+        self.histogram[stopien] = self.histogram.get(stopien, 0) + 1
+        self.nieparzyste += stopien % 2
+        if self._min is not None and stopien < self._min:
+            self._min = stopien
+        if self._max is not None and stopien > self._max:
+            self._max = stopien
+
+    def _usun_stopien(self, stopien):
+        self.histogram[stopien] -= 1
+        self.nieparzyste -= stopien % 2
+        if self.histogram[stopien] == 0:
+            del self.histogram[stopien]
+            if stopien == self._min:
+                self._min = None
+            if stopien == self._max:
+                self._max = None
+
+    def _przenies(self, stary, nowy):
+        if stary == nowy:
+            return
+        min_stary, max_stary = self._min, self._max
+        self._usun_stopien(stary)
+        self._dodaj_stopien(nowy)
+        # stopień zmienia się zwykle o 1, więc nowe ekstremum da się wyznaczyć bez przeglądania histogramu
+        if self._min is None and min_stary == stary and nowy <= stary + 1:
+            self._min = nowy
+        if self._max is None and max_stary == stary and nowy >= stary - 1:
+            self._max = nowy
+
+    def kopia(self):
+        kopia = IndeksStopni.__new__(IndeksStopni)
+        kopia.__dict__.update(self.__dict__)
+        kopia.wej = self.wej[:self.rozmiar].copy()
+        kopia.wyj = self.wyj[:self.rozmiar].copy()
+        kopia.wej.flags.writeable = False
+        kopia.wyj.flags.writeable = False
+        kopia.histogram = dict(self.histogram)
+        return kopia
+
+    def dodaj_wierzcholek(self, index):
+        if index >= len(self.wej):
+            nowa_pojemnosc = max(1, 2 * len(self.wej))
+            self.wej = np.resize(self.wej, nowa_pojemnosc)
+            self.wyj = np.resize(self.wyj, nowa_pojemnosc)
+        self.wej[index] = 0
+        self.wyj[index] = 0
+        self.rozmiar = max(self.rozmiar, index + 1)
+        if not self.histogram:
+            self._min = self._max = 0
+        self._dodaj_stopien(0)
+        self.liczba_wierzcholkow += 1
+
+    def wczytaj(self, n, wiersze, kolumny, krotnosci):
+        wyj = np.bincount(wiersze, weights=krotnosci, minlength=n).astype(np.int64)
+        wej = np.bincount(kolumny, weights=krotnosci, minlength=n).astype(np.int64)
+        self.ustaw(wyj, wej)
+
+    def ustaw(self, wyj, wej):
+        n = len(wyj)
+        self.wyj = np.zeros(max(n, 1), dtype=np.int64)
+        self.wej = np.zeros(max(n, 1), dtype=np.int64)
+        self.wyj[:n] = wyj
+        self.wej[:n] = wej
+        self.rozmiar = n
+        self.liczba_wierzcholkow = n
+
+        stopnie, liczby = np.unique(self.stopnie(np.arange(n)), return_counts=True)
+        self.histogram = dict(zip(stopnie.tolist(), liczby.tolist()))
+        self.nieparzyste = int(liczby[stopnie % 2 == 1].sum())
+        self._min = int(stopnie[0]) if n else None
+        self._max = int(stopnie[-1]) if n else None
+
+    def zmien(self, i, j, delta):
+        stary_i, stary_j = self.stopien(i), self.stopien(j)
+        self.wyj[i] += delta
+        self.wej[j] += delta
+        self._przenies(stary_i, self.stopien(i))
+        self._przenies(stary_j, self.stopien(j))
+
+    def odlacz(self, index, wyjscia, krotnosci_wyjsc, wejscia, krotnosci_wejsc):
+        for j, krotnosc in zip(wyjscia.tolist(), krotnosci_wyjsc.tolist()):
+            stary = self.stopien(j)
+            self.wej[j] -= krotnosc
+            self._przenies(stary, self.stopien(j))
+        for i, krotnosc in zip(wejscia.tolist(), krotnosci_wejsc.tolist()):
+            stary = self.stopien(i)
+            self.wyj[i] -= krotnosc
+            self._przenies(stary, self.stopien(i))
+        self._usun_stopien(self.stopien(index))
+        self.liczba_wierzcholkow -= 1
+        self.wej[index] = 0
+        self.wyj[index] = 0
+
+    def przenies_ostatni(self, index):
+        ostatni = self.rozmiar - 1
+        self.wej[index] = self.wej[ostatni]
+        self.wyj[index] = self.wyj[ostatni]
+        self.rozmiar -= 1
+
+    def kompaktuj(self, zywe):
+        k = len(zywe)
+        self.wej[:k] = self.wej[zywe]
+        self.wyj[:k] = self.wyj[zywe]
+        self.rozmiar = k
+
+    def min_max(self):
+        if self._min is None:
+            self._min = min(self.histogram)
+        if self._max is None:
+            self._max = max(self.histogram)
+        return self._min, self._max
+
+    def parzyste_nieparzyste(self):
+        return self.liczba_wierzcholkow - self.nieparzyste, self.nieparzyste
+
+    def posortowane(self):
+        if not self.histogram:
+            return []
+        min_stopien, max_stopien = self.min_max()
+        posortowane = []
+        for stopien in range(max_stopien, min_stopien - 1, -1):
+            posortowane.extend([stopien] * self.histogram.get(stopien, 0))
+        return posortowane
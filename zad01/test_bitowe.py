@@ -0,0 +1,119 @@
+import random
+import networkx as nx
+import pytest
+from main import GrafNieskierowany, GrafSkierowany
+
+
+def losowy_graf(klasa, rng, **kwargs):
+    graf = klasa(cichy=True, **kwargs)
+    for v in range(rng.randint(1, 90)):
+        graf.dodaj_wierzcholek(v)
+    etykiety = list(graf.wierzcholki)
+    for _ in range(rng.randint(0, 3 * len(etykiety))):
+        graf.dodaj_krawedz(rng.choice(etykiety), rng.choice(etykiety))
+    return graf
+
+
+def graf_networkx(graf):
+    G = nx.DiGraph() if graf.skierowany else nx.Graph()
+    G.add_nodes_from(graf.wierzcholki)
+    wiersze, kolumny, _ = graf.macierz_sasiedztwa.niezerowe()
+    G.add_edges_from((graf.etykiety[i], graf.etykiety[j]) for i, j in zip(wiersze.tolist(), kolumny.tolist()))
+    return G
+
+
+def losowa_zmiana(graf, rng, nastepna_etykieta):
+    etykiety = list(graf.wierzcholki)
+    operacja = rng.random()
+    if operacja < 0.4 and etykiety:
+        graf.dodaj_krawedz(rng.choice(etykiety), rng.choice(etykiety))
+    elif operacja < 0.7 and etykiety:
+        graf.usun_krawedz(rng.choice(etykiety), rng.choice(etykiety))
+    elif operacja < 0.85 or len(etykiety) < 2:
+        graf.dodaj_wierzcholek(nastepna_etykieta)
+    else:
+        graf.usun_wierzcholek(rng.choice(etykiety))
+
+
+def sprawdz(graf):
+    G = graf_networkx(graf)
+    for etykieta in list(graf.wierzcholki)[:5]:
+        odleglosci = nx.single_source_shortest_path_length(G, etykieta)
+        poziomy = graf.bfs(etykieta)
+        assert sorted(v for poziom in poziomy for v in poziom) == sorted(odleglosci)
+        for numer, poziom in enumerate(poziomy):
+            assert all(odleglosci[v] == numer for v in poziom)
+        assert graf.osiagalne(etykieta) == sorted(odleglosci)
+        assert sorted(graf.dfs(etykieta)) == sorted(odleglosci)
+
+    skladowe = nx.weakly_connected_components(G) if graf.skierowany else nx.connected_components(G)
+    assert sorted(sorted(s) for s in graf.skladowe()) == sorted(sorted(s) for s in skladowe)
+
+
+@pytest.mark.parametrize('klasa', [GrafNieskierowany, GrafSkierowany])
+@pytest.mark.parametrize('reprezentacja', ['gesta', 'rzadka'])
+@pytest.mark.parametrize('leniwe_usuwanie', [False, True])
+def test_przeszukiwanie_zgodne_z_networkx_po_zmianach(klasa, reprezentacja, leniwe_usuwanie):
+    rng = random.Random(13)
+    for _ in range(5):
+        graf = losowy_graf(klasa, rng, reprezentacja=reprezentacja, leniwe_usuwanie=leniwe_usuwanie)
+        sprawdz(graf)
+        nastepna_etykieta = 1000
+        for _ in range(30):
+            losowa_zmiana(graf, rng, nastepna_etykieta)
+            nastepna_etykieta += 1
+            # zbiory bitowe zaktualizowane w miejscu muszą być takie same jak zbudowane od nowa
+            zaktualizowane = dict(graf._bitowe)
+            for symetryczna, macierz in zaktualizowane.items():
+                graf._bitowe.clear()
+                nowe = graf.macierz_bitowa(symetryczna)
+                slowa = macierz.slowa[:macierz.n]
+                assert (nowe.slowa[:nowe.n] == slowa[:, :nowe.liczba_slow]).all()
+                assert not slowa[:, nowe.liczba_slow:].any()
+            graf._bitowe = zaktualizowane
+            if graf.wierzcholki:
+                sprawdz(graf)
+
+
+def test_macierz_bitowa_jest_zapamietana():
+    graf = losowy_graf(GrafNieskierowany, random.Random(1))
+    assert graf.macierz_bitowa() is graf.macierz_bitowa()
+
+
+def test_dodawanie_wierzcholkow_po_zbudowaniu_macierzy_bitowej():
+    graf = GrafNieskierowany(cichy=True)
+    for v in range(10):
+        graf.dodaj_wierzcholek(v)
+    graf.dodaj_krawedz(0, 1)
+    assert graf.spojny() is False
+    for v in range(10, 5000):
+        graf.dodaj_wierzcholek(v)
+    graf.dodaj_krawedz(0, 4999)
+    macierz = graf.macierz_bitowa()
+    # pojemność rośnie geometrycznie: najwyżej dwukrotny zapas wierszy i słów
+    assert macierz.n == 5000
+    assert 5000 <= macierz.slowa.shape[0] <= 2 * 5000
+    assert 5000 <= macierz.slowa.shape[1] * 64 <= 2 * 5000 + 64
+    assert graf.osiagalne(0) == [0, 1, 4999]
+
+
+@pytest.mark.parametrize('klasa', [GrafNieskierowany, GrafSkierowany])
+def test_reprezentacja_rzadka_nie_buduje_macierzy_bitowej(klasa):
+    rng = random.Random(4)
+    gesty = losowy_graf(klasa, rng)
+    krawedzie = [(gesty.etykiety[i], gesty.etykiety[j]) for i, j in zip(*gesty.macierz_sasiedztwa.niezerowe()[:2])]
+    rzadki = klasa(cichy=True, reprezentacja='rzadka')
+    for etykieta in gesty.etykiety:
+        rzadki.dodaj_wierzcholek(etykieta)
+    for u, v in krawedzie:
+        if klasa.skierowany or u < v:
+            for _ in range(int(gesty.macierz_sasiedztwa.wartosc(gesty.wierzcholki[u], gesty.wierzcholki[v]))):
+                rzadki.dodaj_krawedz(u, v)
+    # ta sama kolejność wyników co przy macierzy bitowej
+    for etykieta in gesty.etykiety[:10]:
+        assert rzadki.bfs(etykieta) == gesty.bfs(etykieta)
+        assert rzadki.dfs(etykieta) == gesty.dfs(etykieta)
+        assert rzadki.osiagalne(etykieta) == gesty.osiagalne(etykieta)
+    assert rzadki.skladowe() == gesty.skladowe()
+    assert rzadki.eulerowski() == gesty.eulerowski()
+    assert not rzadki._bitowe
@@ -0,0 +1,130 @@
+"""
+Wersjonowane migawki grafu dla wielu wątków czytających i jednego piszącego.
+
+Czytelnik pobiera migawkę (GrafWersjonowany.migawka()) i wykonuje na niej dowolnie długie zapytania -
+migawka jest niezmienna, więc stopnie i sąsiedztwa są ze sobą zgodne niezależnie od trwających zmian.
+Piszący wykonuje operacje na zwykłym obiekcie Graf i co jakiś czas publikuje nową wersję (opublikuj()).
+Wiersze sąsiedztwa są przechowywane osobno dla każdej etykiety i współdzielone między wersjami,
+przy publikacji kopiowane są tylko wiersze wierzchołków zmienionych od poprzedniej wersji.
+Podmiana bieżącej migawki to jedno przypisanie, więc czytelnicy nigdy nie czekają na blokadę.
+"""
+
+import threading
+import numpy as np
+
+
+def _tylko_do_odczytu(tablica):
+    tablica.flags.writeable = False
+    return tablica
+
+
+class Migawka:
+    def __init__(self, wersja, skierowany, wierzcholki, stopnie, wiersze):
+        self.wersja = wersja
+        self.skierowany = skierowany
+        self.wierzcholki = wierzcholki
+        self.stopnie = stopnie
+        self.wiersze = wiersze
+
+    def __len__(self):
+        return len(self.wierzcholki)
+
+    def stopien_wierzcholka(self, etykieta):
+        index = self.wierzcholki.get(etykieta)
+        if index is None:
+            return (None, None) if self.skierowany else None
+        if self.skierowany:
+            return int(self.stopnie.wej[index]), int(self.stopnie.wyj[index])
+        return int(self.stopnie.wyj[index])
+
+    def min_max_stopien(self):
+        if not self.wierzcholki:
+            return None, None
+        return self.stopnie.min_max()
+
+    def parzysty_nieparzysty_stopien(self):
+        return self.stopnie.parzyste_nieparzyste()
+
+    def posortowane_stopnie(self):
+        return self.stopnie.posortowane()
+
+    def sasiedzi(self, etykieta):
+        return self.wiersze.get(etykieta)
+
+    def krotnosc(self, u, v):
+        wiersz = self.wiersze.get(u)
+        if wiersz is None:
+            return 0
+        sasiedzi, krotnosci = wiersz
+        pozycje = np.flatnonzero(sasiedzi == v)
+        return int(krotnosci[pozycje[0]]) if len(pozycje) else 0
+
+
+class GrafWersjonowany:
+    def __init__(self, graf):
+        self.graf = graf
+        self._blokada = threading.Lock()
+        self._zmienione = set()
+        self._usuniete = set()
+        wiersze = {etykieta: self._wiersz(index) for etykieta, index in graf.wierzcholki.items()}
+        self._migawka = self._nowa_migawka(0, wiersze)
+
+    def migawka(self):
+        return self._migawka
+
+    def _wiersz(self, index):
+        sasiedzi, krotnosci = self.graf.macierz_sasiedztwa.sasiedzi_wyjsciowi(index)
+        etykiety = self.graf.etykiety
+        sasiedzi = np.array([etykiety[i] for i in sasiedzi.tolist()], dtype=np.int64)
+        return _tylko_do_odczytu(sasiedzi), _tylko_do_odczytu(krotnosci.astype(np.int64))
+
+    def _nowa_migawka(self, wersja, wiersze):
+        return Migawka(wersja, self.graf.skierowany, dict(self.graf.wierzcholki), self.graf.stopnie.kopia(), wiersze)
+
+    def _poprzednicy(self, etykieta):
+        index = self.graf.wierzcholki.get(etykieta)
+        if index is None:
+            return []
+        sasiedzi, _ = self.graf.macierz_sasiedztwa.sasiedzi_wejsciowi(index)
+        return [self.graf.etykiety[i] for i in sasiedzi.tolist()]
+
+    def wykonaj(self, operacja, *argumenty):
+        with self._blokada:
+            try:
+                etykiety = [int(a) for a in argumenty]
+            except ValueError:
+                etykiety = []
+            # po usunięciu wierzchołka zmieniają się wiersze wszystkich wierzchołków, które miały do niego krawędź
+            poprzednicy = self._poprzednicy(etykiety[0]) if operacja == 'usun_wierzcholek' and etykiety else []
+
+            wynik = getattr(self.graf, operacja)(*argumenty)
+            if wynik:
+                if operacja == 'usun_wierzcholek':
+                    self._usuniete.add(etykiety[0])
+                    self._zmienione.discard(etykiety[0])
+                    self._zmienione.update(poprzednicy)
+                elif operacja == 'dodaj_wierzcholek':
+                    self._usuniete.discard(etykiety[0])
+                    self._zmienione.add(etykiety[0])
+                else:
+                    self._zmienione.update(etykiety if not self.graf.skierowany else etykiety[:1])
+            return wynik
+
+    def opublikuj(self):
+        with self._blokada:
+            poprzednia = self._migawka
+            if not self._zmienione and not self._usuniete:
+                return poprzednia
+
+            wiersze = dict(poprzednia.wiersze)
+            for etykieta in self._usuniete:
+                wiersze.pop(etykieta, None)
+            for etykieta in self._zmienione:
+                index = self.graf.wierzcholki.get(etykieta)
+                if index is not None:
+                    wiersze[etykieta] = self._wiersz(index)
+            self._zmienione.clear()
+            self._usuniete.clear()
+
+            self._migawka = self._nowa_migawka(poprzednia.wersja + 1, wiersze)
+            return self._migawka
@@ -0,0 +1,154 @@
+"""
+Tryb wsadowy edytora grafu - zamiast menu operacje są czytane z pliku (lub ze standardowego wejścia), po jednej w linii:
+
+dodaj_wierzcholek 5
+usun_wierzcholek 5
+dodaj_krawedz 1 2
+usun_krawedz 1 2
+stopien_wierzcholka 1
+min_max_stopien
+parzysty_nieparzysty_stopien
+posortowane_stopnie
+skladowe
+spojny
+eulerowski
+bfs 1
+dfs 1
+osiagalne 1
+
+Wynik każdej operacji jest wypisywany jako linia JSON na standardowe wyjście, a na koniec na standardowe wyjście
+błędów trafia podsumowanie: liczba operacji na sekundę oraz percentyle czasu wykonania dla każdego rodzaju operacji.
+
+Uruchomienie:
+python wsadowy.py -n operacje.txt                      -> graf nieskierowany z main.py
+python wsadowy.py -s --builtin < operacje.txt          -> graf skierowany z main_builtin.py (networkX)
+python wsadowy.py -n --krawedzie krawedzie.txt --rzadka operacje.txt
+python wsadowy.py -n --builtin --kompaktowy operacje.txt
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+import numpy as np
+
+OPERACJE = {
+    'dodaj_wierzcholek': 1,
+    'usun_wierzcholek': 1,
+    'dodaj_krawedz': 2,
+    'usun_krawedz': 2,
+    'stopien_wierzcholka': 1,
+    'min_max_stopien': 0,
+    'parzysty_nieparzysty_stopien': 0,
+    'posortowane_stopnie': 0,
+    'skladowe': 0,
+    'spojny': 0,
+    'eulerowski': 0,
+    'bfs': 1,
+    'dfs': 1,
+    'osiagalne': 1,
+}
+
+# nazwy metod w main_builtin.py różniące się od tych z main.py
+ZAMIENNIKI_BUILTIN = {
+    'stopien_wierzcholka': 'stopnie_wierzcholkow_graf_skierowany',
+}
+
+
+def utworz_graf(args):
+    if args.builtin:
+        import main_builtin
+        klasa = main_builtin.GrafSkierowany if args.skierowany else main_builtin.GrafNieskierowany
+        graf = klasa(kompaktowy=args.kompaktowy)
+        if args.krawedzie:
+            with open(args.krawedzie, 'r') as plik:
+                for linia in plik:
+                    u, v = map(int, linia.strip().split(', '))
+                    for w in (u, v):
+                        if not graf.graph.has_node(w):
+                            graf.dodaj_wierzcholek(w)
+                    graf.dodaj_krawedz(u, v)
+        return graf
+
+    import main
+    klasa = main.GrafSkierowany if args.skierowany else main.GrafNieskierowany
+    reprezentacja = 'rzadka' if args.rzadka else 'gesta'
+    if args.krawedzie:
+        return klasa.z_pliku(args.krawedzie, reprezentacja=reprezentacja, cichy=True)
+    return klasa(reprezentacja=reprezentacja, cichy=True)
+
+
+def metoda(graf, operacja, builtin):
+    if builtin and operacja in ZAMIENNIKI_BUILTIN and not hasattr(graf, operacja):
+        operacja = ZAMIENNIKI_BUILTIN[operacja]
+    return getattr(graf, operacja, None)
+
+
+def wykonaj(graf, operacje, wyjscie, builtin=False):
+    czasy = {}
+    start = time.perf_counter()
+
+    for numer, linia in enumerate(operacje, start=1):
+        czesci = linia.split()
+        if not czesci or czesci[0].startswith('#'):
+            continue
+        operacja, argumenty = czesci[0], czesci[1:]
+
+        if OPERACJE.get(operacja) != len(argumenty):
+            wyjscie.write(json.dumps({'linia': numer, 'operacja': operacja, 'blad': "nieznana operacja lub zła liczba argumentów"}, ensure_ascii=False) + '\n')
+            continue
+        funkcja = metoda(graf, operacja, builtin)
+        if funkcja is None:
+            wyjscie.write(json.dumps({'linia': numer, 'operacja': operacja, 'blad': "operacja nieobsługiwana dla tego grafu"}, ensure_ascii=False) + '\n')
+            continue
+
+        poczatek = time.perf_counter_ns()
+        wynik = funkcja(*argumenty)
+        czasy.setdefault(operacja, []).append(time.perf_counter_ns() - poczatek)
+
+        wyjscie.write(json.dumps({'linia': numer, 'operacja': operacja, 'argumenty': argumenty, 'wynik': wynik}, default=int, ensure_ascii=False) + '\n')
+
+    return time.perf_counter() - start, czasy
+
+
+def podsumowanie(czas_calkowity, czasy, plik=sys.stderr):
+    liczba = sum(len(c) for c in czasy.values())
+    print(f"Wykonano {liczba} operacji w {czas_calkowity:.3f} s ({liczba / max(czas_calkowity, 1e-9):.0f} operacji/s)", file=plik)
+    print(f"{'operacja':<30} {'liczba':>8} {'p50 [us]':>10} {'p90 [us]':>10} {'p99 [us]':>10} {'max [us]':>10}", file=plik)
+    for operacja, pomiary in sorted(czasy.items()):
+        p50, p90, p99, maks = np.percentile(np.array(pomiary) / 1000, [50, 90, 99, 100])
+        print(f"{operacja:<30} {len(pomiary):>8} {p50:>10.1f} {p90:>10.1f} {p99:>10.1f} {maks:>10.1f}", file=plik)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tryb wsadowy edytora grafu.")
+    rodzaj = parser.add_mutually_exclusive_group(required=True)
+    rodzaj.add_argument('-s', dest='skierowany', action='store_true', help="graf skierowany")
+    rodzaj.add_argument('-n', dest='skierowany', action='store_false', help="graf nieskierowany")
+    parser.add_argument('--builtin', action='store_true', help="użyj grafu z main_builtin.py (networkX)")
+    parser.add_argument('--kompaktowy', action='store_true', help="liczniki krawędzi zamiast grafu networkX (tylko main_builtin.py)")
+    parser.add_argument('--rzadka', action='store_true', help="rzadka reprezentacja macierzy (tylko main.py)")
+    parser.add_argument('--krawedzie', help="plik z krawędziami wczytywany przed wykonaniem operacji")
+    parser.add_argument('operacje', nargs='?', help="plik z operacjami (domyślnie standardowe wejście)")
+    args = parser.parse_args()
+
+    wyjscie = sys.stdout
+    # komunikaty wypisywane przez metody grafu nie mogą mieszać się z wynikami JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            graf = utworz_graf(args)
+        except OverflowError as e:
+            parser.error(f"nie można wczytać grafu z pliku '{args.krawedzie}': {e}")
+        if args.operacje:
+            with open(args.operacje, 'r') as plik:
+                czas_calkowity, czasy = wykonaj(graf, plik, wyjscie, args.builtin)
+        else:
+            czas_calkowity, czasy = wykonaj(graf, sys.stdin, wyjscie, args.builtin)
+
+    wyjscie.flush()
+    podsumowanie(czas_calkowity, czasy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Trwały zapis sesji edytora grafu.
+
+Migawka to jeden plik: nagłówek JSON (klasa grafu, reprezentacja, numer ostatniej uwzględnionej operacji)
+oraz surowe tablice NumPy (macierz albo tablice CSR, etykiety, stopnie) wyrównane tak,
+aby dało się je odczytać przez np.memmap bez kopiowania.
+
+Dziennik to plik tekstowy, do którego dopisywana jest każda udana operacja zmieniająca graf
+w postaci: "numer operacja argumenty". Przy starcie wczytywana jest migawka i odtwarzane są tylko
+operacje o numerach większych niż zapisany w migawce.
+"""
+
+import json
+import os
+import struct
+import numpy as np
+
+MAGIA = b'GRAFMIG1'
+WYROWNANIE = 64
+
+
+def _wyrownaj(liczba):
+    return (liczba + WYROWNANIE - 1) // WYROWNANIE * WYROWNANIE
+
+
+def zapisz_migawke(sciezka, naglowek, tablice):
+    tablice = {nazwa: np.ascontiguousarray(tablica) for nazwa, tablica in tablice.items()}
+    opisy = {}
+    przesuniecie = 0
+    for nazwa, tablica in tablice.items():
+        opisy[nazwa] = {'dtype': tablica.dtype.str, 'ksztalt': list(tablica.shape), 'przesuniecie': przesuniecie}
+        przesuniecie += _wyrownaj(tablica.nbytes)
+
+    dane_naglowka = json.dumps(dict(naglowek, tablice=opisy)).encode()
+    poczatek = _wyrownaj(len(MAGIA) + 8 + len(dane_naglowka))
+
+    plik_tymczasowy = sciezka + '.tmp'
+    with open(plik_tymczasowy, 'wb') as plik:
+        plik.write(MAGIA)
+        plik.write(struct.pack('<Q', len(dane_naglowka)))
+        plik.write(dane_naglowka)
+        for nazwa, tablica in tablice.items():
+            plik.seek(poczatek + opisy[nazwa]['przesuniecie'])
+            tablica.tofile(plik)
+        plik.flush()
+        os.fsync(plik.fileno())
+    os.replace(plik_tymczasowy, sciezka)
+
+
+def wczytaj_migawke(sciezka):
+    with open(sciezka, 'rb') as plik:
+        if plik.read(len(MAGIA)) != MAGIA:
+            raise ValueError(f"Plik '{sciezka}' nie jest migawką grafu.")
+        dlugosc, = struct.unpack('<Q', plik.read(8))
+        naglowek = json.loads(plik.read(dlugosc))
+    poczatek = _wyrownaj(len(MAGIA) + 8 + dlugosc)
+
+    tablice = {}
+    for nazwa, opis in naglowek.pop('tablice').items():
+        ksztalt = tuple(opis['ksztalt'])
+        if 0 in ksztalt:
+            tablice[nazwa] = np.zeros(ksztalt, dtype=opis['dtype'])
+        else:
+            # tryb 'c' (copy-on-write): zmiany w pamięci nie trafiają do pliku migawki
+            tablice[nazwa] = np.memmap(sciezka, dtype=opis['dtype'], mode='c', offset=poczatek + opis['przesuniecie'], shape=ksztalt)
+    return naglowek, tablice
+
+
+class DziennikOperacji:
+    def __init__(self, sciezka):
+        self.sciezka = sciezka
+        self.plik = open(sciezka, 'a')
+
+    def zapisz(self, numer, operacja, argumenty):
+        self.plik.write(' '.join([str(numer), operacja, *map(str, argumenty)]) + '\n')
+        self.plik.flush()
+
+    def wyczysc(self):
+        self.plik.close()
+        self.plik = open(self.sciezka, 'w')
+
+    def zamknij(self):
+        self.plik.close()
+
+    @staticmethod
+    def odczytaj(sciezka, od_numeru):
+        if not os.path.exists(sciezka):
+            return
+        with open(sciezka, 'r') as plik:
+            for linia in plik:
+                if not linia.endswith('\n'):
+                    break  # niedokończony zapis sprzed awarii
+                numer, operacja, *argumenty = linia.split()
+                if int(numer) > od_numeru:
+                    yield int(numer), operacja, argumenty
+
+
+class Sesja:
+    OPERACJE = ('dodaj_wierzcholek', 'usun_wierzcholek', 'dodaj_krawedz', 'usun_krawedz')
+
+    def __init__(self, graf, sciezka=None, numer_operacji=0, co_ile=1000):
+        self.graf = graf
+        self.sciezka_migawki = sciezka + '.migawka' if sciezka else None
+        self.dziennik = DziennikOperacji(sciezka + '.dziennik') if sciezka else None
+        self.numer_operacji = numer_operacji
+        self.co_ile = co_ile
+        self.od_punktu_kontrolnego = 0
+
+    @classmethod
+    def otworz(cls, klasa, sciezka, plik_krawedzi=None, co_ile=1000, **kwargs):
+        numer_operacji = 0
+        if os.path.exists(sciezka + '.migawka'):
+            graf, numer_operacji = klasa.z_migawki(sciezka + '.migawka', **kwargs)
+        elif plik_krawedzi is not None and os.path.exists(plik_krawedzi):
+            graf = klasa.z_pliku(plik_krawedzi, **kwargs)
+        else:
+            graf = klasa(**kwargs)
+
+        cichy = graf.cichy
+        graf.cichy = True
+        for numer, operacja, argumenty in DziennikOperacji.odczytaj(sciezka + '.dziennik', numer_operacji):
+            getattr(graf, operacja)(*argumenty)
+            numer_operacji = numer
+        graf.cichy = cichy
+
+        return cls(graf, sciezka, numer_operacji, co_ile)
+
+    def wykonaj(self, operacja, *argumenty):
+        wynik = getattr(self.graf, operacja)(*argumenty)
+        if self.dziennik is not None and operacja in self.OPERACJE and wynik:
+            self.numer_operacji += 1
+            self.dziennik.zapisz(self.numer_operacji, operacja, [int(a) for a in argumenty])
+            self.od_punktu_kontrolnego += 1
+            if self.od_punktu_kontrolnego >= self.co_ile:
+                self.punkt_kontrolny()
+        return wynik
+
+    def punkt_kontrolny(self):
+        if self.dziennik is None:
+            return
+        self.graf.zapisz_migawke(self.sciezka_migawki, self.numer_operacji)
+        self.dziennik.wyczysc()
+        self.od_punktu_kontrolnego = 0
+
+    def zamknij(self):
+        if self.dziennik is None:
+            return
+        self.punkt_kontrolny()
+        self.dziennik.zamknij()
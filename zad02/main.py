@@ -1,85 +1,352 @@
+import math
+import os
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FFMpegWriter, PillowWriter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 class Graph:
     def __init__(self, edges):
-        self.edges = edges
+        # edges is kept compact: an edge is removed by moving the last one into its slot,
+        # edge_index maps each edge to its slot and incident maps each vertex to its edges
+        self.edges = list(edges)
+        self.edge_index = {}
+        self.incident = {}
         self.vertices = set()
-        for u, v in self.edges:
+        for i, (u, v) in enumerate(self.edges):
+            self.edge_index[(u, v)] = i
+            self.incident.setdefault(u, set()).add((u, v))
+            self.incident.setdefault(v, set()).add((u, v))
             self.vertices.add(u)
             self.vertices.add(v)
 
+    def random_edge(self, rng=random):
+        return self.edges[rng.randrange(len(self.edges))]
+
+    def remove_edge(self, edge):
+        u, v = edge
+        i = self.edge_index.pop(edge)
+        last = self.edges.pop()
+        if i < len(self.edges):
+            self.edges[i] = last
+            self.edge_index[last] = i
+        self.incident[u].discard(edge)
+        self.incident[v].discard(edge)
+
     def remove_incident_edges(self, vertex):
-        incident_edges = [(u, v) for u, v in self.edges if u == vertex or v == vertex]
-        self.edges = [(u, v) for u, v in self.edges if u != vertex and v != vertex]
+        incident_edges = list(self.incident.get(vertex, ()))
+        for edge in incident_edges:
+            self.remove_edge(edge)
         return incident_edges
 
-    def draw_graph(self, removed_edges, current_edges, incident_edges, message):
-        G = nx.Graph()
-        G.add_edges_from(self.edges + removed_edges + current_edges + incident_edges)
+class StepRenderer:
+    # the layout and the static part of the picture (nodes, labels, all edges in gray) are computed once,
+    # each step only replaces the segments of the coloured edge collections and the message
+    def __init__(self, edges, output=None, fps=1, labels=None):
+        self.G = nx.Graph()
+        self.G.add_edges_from(edges)
+        self.pos = nx.spring_layout(self.G, seed=0)
+        self.labels = {v: labels[v] for v in self.G} if labels is not None else None
+        self.output = output
+        self.frame_number = 0
+        if output is None:
+            return
 
-        plt.figure(figsize=(8, 6))
-        pos = nx.spring_layout(G)
+        self.figure = Figure(figsize=(8, 6))
+        FigureCanvasAgg(self.figure)
+        self.artists = self.draw_static(self.figure.add_subplot())
+        if output.endswith('.gif'):
+            self.writer = PillowWriter(fps=fps)
+        elif output.endswith('.mp4'):
+            self.writer = FFMpegWriter(fps=fps)
+        else:
+            # numbered PNG frames in the given directory
+            self.writer = None
+            os.makedirs(output, exist_ok=True)
+        if self.writer is not None:
+            self.writer.setup(self.figure, output, dpi=100)
 
-        nx.draw(G, pos, with_labels=True, node_size=700, node_color='lightblue', 
+    def draw_static(self, ax):
+        nx.draw(self.G, self.pos, ax=ax, with_labels=True, labels=self.labels, node_size=700, node_color='lightblue',
                 font_size=10, font_weight='bold', edge_color='gray')
 
-        if removed_edges:
-            nx.draw_networkx_edges(G, pos, edgelist=removed_edges, edge_color='red', width=2.5)        
+        collections = []
+        for color in ('red', 'green', 'blue'):
+            collection = LineCollection([], colors=color, linewidths=2.5, zorder=1.5)
+            ax.add_collection(collection)
+            collections.append(collection)
 
-        if incident_edges:
-            nx.draw_networkx_edges(G, pos, edgelist=incident_edges, edge_color='green', width=2.5)
+        x_values, y_values = zip(*self.pos.values())
+        ax.set_xlim(min(x_values) - 0.5, max(x_values) + 0.5)
+        ax.set_ylim(min(y_values) - 0.5, max(y_values) + 0.5)
+        text = ax.text(min(x_values) - 0.2, max(y_values) + 0.2, "", fontsize=10, verticalalignment='top',
+                       bbox=dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="lightyellow"))
+        return collections, text
 
-        if current_edges:
-            nx.draw_networkx_edges(G, pos, edgelist=current_edges, edge_color='blue', width=2.5)
+    def draw_step(self, removed_edges, current_edges, incident_edges, message):
+        if self.output is None:
+            plt.figure(figsize=(8, 6))
+            artists = self.draw_static(plt.gca())
+        else:
+            artists = self.artists
 
-        x_values, y_values = zip(*pos.values())
-        text_x = min(x_values) - 0.2
-        text_y = max(y_values) + 0.2 
+        collections, text = artists
+        for collection, edges in zip(collections, (removed_edges, incident_edges, current_edges)):
+            collection.set_segments([(self.pos[u], self.pos[v]) for u, v in edges])
+        text.set_text(message)
 
-        plt.xlim(min(x_values) - 0.5, max(x_values) + 0.5)
-        plt.ylim(min(y_values) - 0.5, max(y_values) + 0.5)
+        self.frame_number += 1
+        if self.output is None:
+            plt.show()
+        elif self.writer is None:
+            self.figure.savefig(os.path.join(self.output, f"krok_{self.frame_number:04d}.png"))
+        else:
+            self.writer.grab_frame()
 
-        plt.text(text_x, text_y, message, fontsize=10, bbox=dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="lightyellow"))
-        plt.show()
+    def close(self):
+        if self.output is not None and self.writer is not None:
+            self.writer.finish()
 
-def approx_vertex_cover(graph):
-    print(f"W grafie mamy następujące krawędzie: {graph.edges}")
+def approx_vertex_cover(graph, rng=random, show_steps=True, renderer=None, labels=None):
+    if show_steps:
+        print(f"W grafie mamy następujące krawędzie: {with_labels(graph.edges, labels)}")
+        renderer = renderer or StepRenderer(graph.edges, labels=labels)
     vertex_cover = set()
     removed_edges = []
     while graph.edges:
-        u, v = random.choice(graph.edges)
+        u, v = graph.random_edge(rng)
         vertex_cover.add(u)
         vertex_cover.add(v)
 
         incident_edges = graph.remove_incident_edges(u) + graph.remove_incident_edges(v)
+        if not show_steps:
+            continue
 
-        message = (f"Wybrano krawędź: ({u}, {v})\n"
-                   f"Pozostałe krawędzie: {graph.edges}\n"
-                   f"Obecne pokrycie wierzchołkowe: {vertex_cover}")
+        (lu, lv), = with_labels([(u, v)], labels)
+        message = (f"Wybrano krawędź: ({lu}, {lv})\n"
+                   f"Pozostałe krawędzie: {with_labels(graph.edges, labels)}\n"
+                   f"Obecne pokrycie wierzchołkowe: {cover_labels(vertex_cover, labels)}")
         
         current_edges = [(u, v)]
-        graph.draw_graph(removed_edges, current_edges, incident_edges, message)
+        renderer.draw_step(removed_edges, current_edges, incident_edges, message)
 
         removed_edges.extend(incident_edges)
 
+    if show_steps:
+        renderer.close()
     return vertex_cover
 
-filename = "krawedzie.txt"
-def read_edges_from_file(filename):
-    edges = set()
-    with open(filename, 'r') as file:
-        for line in file:
-            u, v = line.strip().split(',')
-            u, v = u.strip(), v.strip()
-            if u != v:
-                edge = tuple(sorted((u, v)))
-                edges.add(edge)
-    return list(edges)
-
-edges = read_edges_from_file(filename)
-graph = Graph(edges)
-
-vertex_cover = approx_vertex_cover(graph)
-print(f"Przybliżone pokrycie wierzchołkowe: {vertex_cover}")
\ No newline at end of file
+def neighbour_lists(edges):
+    neighbours = {}
+    for u, v in edges:
+        neighbours.setdefault(u, []).append(v)
+        neighbours.setdefault(v, []).append(u)
+    return neighbours
+
+def prune_cover(neighbours, vertex_cover):
+    # a vertex whose neighbours are all in the cover is redundant; once it is dropped
+    # its neighbours must stay, so a single pass over the adjacency lists is enough
+    pruned = set(vertex_cover)
+    for vertex in vertex_cover:
+        if all(w in pruned for w in neighbours.get(vertex, ())):
+            pruned.discard(vertex)
+    return pruned
+
+trial_edges = None
+trial_neighbours = None
+
+def init_trial(edges):
+    global trial_edges, trial_neighbours
+    trial_edges = edges
+    trial_neighbours = neighbour_lists(edges)
+
+def run_trial(seed):
+    vertex_cover = approx_vertex_cover(Graph(trial_edges), random.Random(seed), show_steps=False)
+    pruned = prune_cover(trial_neighbours, vertex_cover)
+    return len(pruned), seed, len(vertex_cover), pruned
+
+def multi_start_vertex_cover(edges, trials, seed=0, workers=None):
+    seeds = range(seed, seed + trials)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_trial, initargs=(edges,)) as executor:
+        results = list(executor.map(run_trial, seeds, chunksize=max(1, trials // (4 * (workers or os.cpu_count() or 1)))))
+    return min(results, key=lambda result: (result[0], result[1]))
+
+def read_edge_array(filename):
+    # labels are mapped to dense integer ids, every pair is stored as (min, max), self-loops are dropped
+    # and duplicates removed with one sort; labels[id] gives back the original label
+    tokens = []
+    with open(filename, 'rb') as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            fields = line.split(b',')
+            if len(fields) != 2:
+                raise ValueError(f"Linia {number} pliku {filename} nie zawiera dokładnie dwóch wierzchołków: {line.strip().decode()!r}")
+            # labels may contain inner spaces, only the whitespace around the comma is dropped
+            tokens += [fields[0].strip(), fields[1].strip()]
+    tokens = np.array(tokens, dtype=bytes)
+    if tokens.dtype.itemsize <= 8:
+        # labels up to 8 bytes are compared as 64-bit integers instead of strings
+        keys, ids = np.unique(tokens.astype('S8').view(np.uint64), return_inverse=True)
+        labels = keys.view('S8')
+    else:
+        labels, ids = np.unique(tokens, return_inverse=True)
+    pairs = ids.reshape(-1, 2).astype(np.int64)
+    u, v = pairs.min(axis=1), pairs.max(axis=1)
+    keep = u != v
+    n = len(labels)
+    keys = np.unique(u[keep] * n + v[keep])
+    return np.column_stack((keys // n, keys % n)), [label.decode() for label in labels.tolist()]
+
+def with_labels(edges, labels):
+    if labels is None:
+        return edges
+    return [(labels[u], labels[v]) for u, v in edges]
+
+def cover_labels(vertex_cover, labels):
+    if labels is None:
+        return vertex_cover
+    return {labels[v] for v in vertex_cover}
+
+def streaming_vertex_cover(lines, report_every=1000000):
+    # one pass over the edge stream: both endpoints of every edge not yet covered are taken,
+    # so the chosen edges form a maximal matching and only the cover itself is kept in memory
+    vertex_cover = set()
+    edge_count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        u, v = line.split(',')
+        u, v = u.strip(), v.strip()
+        edge_count += 1
+        if u != v and u not in vertex_cover and v not in vertex_cover:
+            vertex_cover.add(u)
+            vertex_cover.add(v)
+        if edge_count % report_every == 0:
+            print(f"Przetworzono {edge_count} krawędzi, rozmiar pokrycia: {len(vertex_cover)}", file=sys.stderr)
+    print(f"Przetworzono {edge_count} krawędzi, rozmiar pokrycia: {len(vertex_cover)}", file=sys.stderr)
+    return vertex_cover
+
+def matching_cover(edges):
+    vertex_cover = set()
+    for u, v in edges:
+        if u not in vertex_cover and v not in vertex_cover:
+            vertex_cover.add(u)
+            vertex_cover.add(v)
+    return vertex_cover
+
+def kernelize(edges, budget=None):
+    # reduction rules: a degree-0 vertex is dropped, the neighbour of a degree-1 vertex goes to the cover,
+    # and with an upper bound k on the optimum a vertex of degree > k must be in every optimal cover,
+    # so the optimum of the input equals len(forced) + the optimum of the returned kernel
+    neighbours = {}
+    for u, v in edges:
+        neighbours.setdefault(u, set()).add(v)
+        neighbours.setdefault(v, set()).add(u)
+    forced = set()
+    k = budget
+
+    def take(vertex):
+        forced.add(vertex)
+        for w in neighbours.pop(vertex):
+            neighbours[w].discard(vertex)
+            stack.append(w)
+
+    stack = list(neighbours)
+    while stack:
+        while stack:
+            vertex = stack.pop()
+            if vertex not in neighbours:
+                continue
+            degree = len(neighbours[vertex])
+            if degree == 0:
+                del neighbours[vertex]
+            elif degree == 1:
+                take(next(iter(neighbours[vertex])))
+                k = k - 1 if k is not None else None
+            elif k is not None and degree > k:
+                take(vertex)
+                k -= 1
+        if k is not None:
+            # k only decreases, so vertices checked earlier may have become high-degree
+            stack = [vertex for vertex, adjacent in neighbours.items() if len(adjacent) > k]
+
+    kernel_edges = [(u, v) for u, v in edges if u in neighbours and v in neighbours]
+    return kernel_edges, forced
+
+def lp_lower_bound(edges):
+    import pulp as pl
+
+    if not edges:
+        return 0
+    model = pl.LpProblem(name="Pokrycie wierzchołkowe (relaksacja)", sense=pl.LpMinimize)
+    vertices = sorted({w for edge in edges for w in edge})
+    x = {w: pl.LpVariable(f"x_{i}", lowBound=0, upBound=1) for i, w in enumerate(vertices)}
+    model += pl.lpSum(x.values())
+    for u, v in edges:
+        model += x[u] + x[v] >= 1
+
+    status = model.solve(pl.PULP_CBC_CMD(msg=False))
+    if pl.LpStatus[status] != "Optimal":
+        raise RuntimeError("Relaksacja liniowa nie została rozwiązana optymalnie.")
+    # the optimum is an integer, so the LP bound can be rounded up
+    return math.ceil(pl.value(model.objective) - 1e-6)
+
+def main():
+    filename = "krawedzie.txt"
+    if "--stream" in sys.argv:
+        # python main.py --stream [plik | -]  ("-" oznacza standardowe wejście)
+        index = sys.argv.index("--stream")
+        source = sys.argv[index + 1] if index + 1 < len(sys.argv) else filename
+        if source == "-":
+            vertex_cover = streaming_vertex_cover(sys.stdin)
+        else:
+            with open(source, 'r') as file:
+                vertex_cover = streaming_vertex_cover(file)
+        print(f"Przybliżone pokrycie wierzchołkowe ({len(vertex_cover)} wierzchołków): {vertex_cover}")
+        return
+
+    edge_array, labels = read_edge_array(filename)
+    edges = list(map(tuple, edge_array.tolist()))
+    forced = set()
+    if "--kernel" in sys.argv:
+        all_edges = len(edges)
+        edges, forced = kernelize(edges, budget=len(matching_cover(edges)))
+        print(f"Jądro: {len(edges)} z {all_edges} krawędzi, wierzchołki wymuszone przez reguły redukcji: {cover_labels(forced, labels)}")
+
+    if "--trials" in sys.argv:
+        # python main.py --trials K [--seed S] [--workers W]
+        trials = int(sys.argv[sys.argv.index("--trials") + 1])
+        seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+        size, best_seed, unpruned_size, vertex_cover = multi_start_vertex_cover(edges, trials, seed, workers)
+        print(f"Najmniejsze pokrycie z {trials} prób: {size + len(forced)} wierzchołków (ziarno {best_seed}, przed usunięciem zbędnych wierzchołków {unpruned_size + len(forced)})")
+    else:
+        # python main.py [--no-draw | --animate plik.gif | plik.mp4 | katalog] [--fps N]
+        graph = Graph(edges)
+        if "--no-draw" in sys.argv:
+            vertex_cover = approx_vertex_cover(graph, show_steps=False)
+        elif "--animate" in sys.argv:
+            output = sys.argv[sys.argv.index("--animate") + 1]
+            fps = int(sys.argv[sys.argv.index("--fps") + 1]) if "--fps" in sys.argv else 1
+            vertex_cover = approx_vertex_cover(graph, renderer=StepRenderer(graph.edges, output, fps, labels), labels=labels)
+            print(f"Kolejne kroki algorytmu zapisano do: {output}")
+        else:
+            vertex_cover = approx_vertex_cover(graph, labels=labels)
+
+    vertex_cover |= forced
+    print(f"Przybliżone pokrycie wierzchołkowe: {cover_labels(vertex_cover, labels)}")
+
+    if "--lp" in sys.argv:
+        lower_bound = lp_lower_bound(edges) + len(forced)
+        print(f"Dolne ograniczenie (relaksacja LP): {lower_bound}, rozmiar pokrycia: {len(vertex_cover)}, "
+              f"stosunek: {len(vertex_cover) / max(lower_bound, 1):.3f}")
+
+if __name__ == "__main__":
+    main()
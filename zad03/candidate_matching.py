@@ -0,0 +1,113 @@
+"""
+Rzadkie skojarzenie kandydatów dla dużej liczby wierzchołków nieparzystego stopnia.
+
+Zamiast grafu pełnego G' na wszystkich k wierzchołkach nieparzystych (O(k^2) krawędzi) dla każdego
+wierzchołka nieparzystego zachowywanych jest tylko r najbliższych innych wierzchołków nieparzystych.
+Dijkstra z każdego źródła zatrzymuje się po znalezieniu r takich wierzchołków, więc przegląda tylko
+najbliższe otoczenie źródła. Minimalne skojarzenie liczone jest na tym rzadkim grafie; wierzchołki,
+które zostały nieskojarzone, są łączone zachłannie w pary (najpierw najbliższe).
+"""
+
+import heapq
+from itertools import combinations
+import networkx as nx
+from parallel_paths import freeze_graph
+
+
+def as_number(distance):
+    return int(distance) if float(distance).is_integer() else distance
+
+
+class CandidatePaths:
+    def __init__(self, graph, sources, neighbours):
+        self.nodes, self.index, indptr, indices, weights = freeze_graph(graph)
+        self.csr = (indptr.tolist(), indices.tolist(), weights.tolist())
+        is_source = [False] * len(self.nodes)
+        for source in sources:
+            is_source[self.index[source]] = True
+
+        self.trees = {}
+        self.candidates = []
+        for source in sources:
+            tree = self.search(self.index[source], is_source, neighbours)
+            self.trees[source] = tree
+            for target in tree[2]:
+                self.candidates.append((source, self.nodes[target], as_number(tree[1][target])))
+
+    def search(self, source, is_target, limit=None):
+        # Dijkstra stopped after `limit` targets (other than the source) have been settled
+        indptr, indices, weights = self.csr
+        distances = {source: 0.0}
+        predecessors = {source: -1}
+        settled = set()
+        found = []
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled.add(u)
+            if u != source and is_target[u]:
+                found.append(u)
+                if limit is not None and len(found) == limit:
+                    break
+            for position in range(indptr[u], indptr[u + 1]):
+                v = indices[position]
+                candidate = d + weights[position]
+                if candidate < distances.get(v, float('inf')):
+                    distances[v] = candidate
+                    predecessors[v] = u
+                    heapq.heappush(heap, (candidate, v))
+        settled_distances = {u: distances[u] for u in settled}
+        return predecessors, settled_distances, found
+
+    def tree_for(self, source, target):
+        i, j = self.index[source], self.index[target]
+        if source in self.trees and j in self.trees[source][1]:
+            return self.trees[source], i, j
+        if target in self.trees and i in self.trees[target][1]:
+            return self.trees[target], j, i
+        # pair outside the candidate set (greedy repair): full search from the source
+        tree = self.search(i, [False] * len(self.nodes))
+        self.trees[source] = tree
+        return (tree, i, j) if j in tree[1] else (None, i, j)
+
+    def distance(self, source, target):
+        tree, _, end = self.tree_for(source, target)
+        return None if tree is None else as_number(tree[1][end])
+
+    def path(self, source, target):
+        tree, start, end = self.tree_for(source, target)
+        path = [end]
+        while path[-1] != start:
+            path.append(tree[0][path[-1]])
+        path = [self.nodes[i] for i in reversed(path)]
+        return path if path[0] == source else path[::-1]
+
+
+def candidate_graph(paths):
+    G_prime = nx.Graph()
+    for u, v, w in paths.candidates:
+        G_prime.add_edge(u, v, weight=w)
+    return G_prime
+
+
+def sparse_min_weight_matching(G_prime, paths, nodes):
+    matching = nx.algorithms.matching.min_weight_matching(G_prime)
+    matched = {w for edge in matching for w in edge}
+    unmatched = [w for w in nodes if w not in matched]
+
+    pairs = []
+    for u, v in combinations(unmatched, 2):
+        distance = paths.distance(u, v)
+        if distance is not None:
+            pairs.append((distance, u, v))
+    pairs.sort(key=lambda pair: pair[0])
+
+    repaired = []
+    for distance, u, v in pairs:
+        if u not in matched and v not in matched:
+            matched.update((u, v))
+            G_prime.add_edge(u, v, weight=distance)
+            repaired.append((u, v))
+    return matching | set(repaired), repaired
@@ -0,0 +1,24 @@
+import networkx as nx
+import pytest
+
+
+def build_random_multigraph(rng, n, extra_edges=None, eulerian=False):
+    # a random spanning tree keeps the graph connected; extra_edges (default n) random edges add
+    # cycles and parallel edges, and eulerian=True pairs up the odd vertices with one more edge each
+    G = nx.MultiGraph()
+    for i in range(1, n):
+        G.add_edge(i, rng.randrange(i), weight=rng.randint(1, 9))
+    for _ in range(n if extra_edges is None else extra_edges):
+        u, v = rng.sample(range(n), 2)
+        G.add_edge(u, v, weight=rng.randint(1, 9))
+    if eulerian:
+        odd = [v for v in G if G.degree[v] % 2 != 0]
+        rng.shuffle(odd)
+        for u, v in zip(odd[::2], odd[1::2]):
+            G.add_edge(u, v, weight=rng.randint(1, 9))
+    return G
+
+
+@pytest.fixture
+def random_multigraph():
+    return build_random_multigraph
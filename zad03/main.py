@@ -21,12 +21,71 @@ Przypadek 3:
 import networkx as nx
 from itertools import combinations
 import matplotlib.pyplot as plt
-
-def chinese_postman_problem(graph):
+import sys
+import io
+import hashlib
+from contextlib import redirect_stdout
+from parallel_paths import ParallelShortestPaths
+from postman_tour import write_tour
+from candidate_matching import CandidatePaths, candidate_graph, sparse_min_weight_matching
+from postman_solver import PostmanSolver
+
+EXACT_MATCHING_LIMIT = 300
+
+class DijkstraTrees:
+    # one single-source Dijkstra per source: predecessors and distances to every vertex
+    def __init__(self, graph, sources):
+        self.trees = {source: nx.dijkstra_predecessor_and_distance(graph, source, weight='weight') for source in sources}
+
+    def distance(self, source, target):
+        return self.trees[source][1].get(target)
+
+    def path(self, source, target):
+        predecessors, _ = self.trees[source]
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]][0])
+        return path[::-1]
+
+def complete_odd_graph(paths, odd_degree_nodes):
+    G_prime = nx.Graph()
+    for u, v in combinations(odd_degree_nodes, 2):
+        distance = paths.distance(u, v)
+        if distance is not None:
+            G_prime.add_edge(u, v, weight=distance)
+    return G_prime
+
+class OutputRecorder:
+    # writes to the console and keeps a copy of everything printed
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def file_hash(file_path):
+    with open(file_path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def save_tour(graph, tour_file, start=None):
+    edge_count, total_cost = write_tour(graph, tour_file, start)
+    print(f"Trasę listonosza ({edge_count} krawędzi, koszt całkowity: {total_cost}) zapisano do pliku {tour_file}")
+
+def chinese_postman_problem(graph, workers=None, neighbours=None, tour_file=None):
     odd_degree_nodes = [node for node in graph.nodes if graph.degree[node] % 2 != 0]
     odd_count = len(odd_degree_nodes)
 
     if odd_count == 0:
+        if tour_file:
+            # with --tour the route is only streamed to the file: no edge list, route text or drawing
+            print("Graf jest eulerowski.")
+            save_tour(graph, tour_file)
+            return
         
         eulerian_circuit = list(nx.eulerian_circuit(graph))
         path_text = " ⟶ ".join(str(u) for u, v in eulerian_circuit) + " ⟶ " + str(eulerian_circuit[0][0])
@@ -77,6 +136,15 @@ def chinese_postman_problem(graph):
             if not graph.has_edge(u, v):
                 graph.add_edge(u, v, weight=1)
 
+        if tour_file:
+            print("Graf jest półeulerowski.")
+            print(f"Najkrótsza droga z {start} do {end}: {shortest_path_text}")
+            # the way back from end to start as one edge, expanded into the shortest path
+            key = graph.add_edge(end, start, weight=nx.path_weight(graph, shortest_path, 'weight'), path=shortest_path_reversed)
+            save_tour(graph, tour_file, start)
+            graph.remove_edge(end, start, key)
+            return
+
         eulerian_path = list(nx.eulerian_path(graph, source=start))
         eulerian_path_text = " ⟶ ".join(str(u) for u, v in eulerian_path) + " ⟶ " + str(eulerian_path[-1][1])
 
@@ -110,7 +178,6 @@ def chinese_postman_problem(graph):
             f"Najkrótsza droga z {start} do {end}: {shortest_path_text}\n"
             f"Trasa listonosza: {postman_path}"
         )
-
         plt.text(
             text_x, text_y, message,
             fontsize=10,
@@ -144,16 +211,32 @@ def chinese_postman_problem(graph):
 
         print(f"Wierzchołki nieparzystego stopnia: {odd_degree_nodes}")
         
-        odd_pairs = list(combinations(odd_degree_nodes, 2))
-        G_prime = nx.Graph()
-        for u, v in odd_pairs:
-            G_prime.add_edge(u, v, weight=nx.dijkstra_path_length(graph, u, v))
+        if neighbours:
+            paths = CandidatePaths(graph, odd_degree_nodes, neighbours)
+            G_prime = candidate_graph(paths)
+        else:
+            if workers:
+                paths = ParallelShortestPaths(graph, odd_degree_nodes, workers)
+            else:
+                paths = DijkstraTrees(graph, odd_degree_nodes)
+            G_prime = complete_odd_graph(paths, odd_degree_nodes)
 
         print("Krawędzie w G':")
         for u, v, w in G_prime.edges(data='weight'):
             print(f"{u} - {v}, waga: {w}")
 
-        min_weight_matching = nx.algorithms.matching.min_weight_matching(G_prime)            
+        if neighbours:
+            min_weight_matching, repaired = sparse_min_weight_matching(G_prime, paths, odd_degree_nodes)
+            cost = sum(G_prime[u][v]['weight'] for u, v in min_weight_matching)
+            print(f"Skojarzenie na {neighbours} najbliższych sąsiadach: koszt {cost}, pary dobrane zachłannie: {repaired}")
+            if len(odd_degree_nodes) <= EXACT_MATCHING_LIMIT:
+                exact_graph = complete_odd_graph(DijkstraTrees(graph, odd_degree_nodes), odd_degree_nodes)
+                exact_matching = nx.algorithms.matching.min_weight_matching(exact_graph)
+                exact_cost = sum(exact_graph[u][v]['weight'] for u, v in exact_matching)
+                print(f"Koszt dokładnego skojarzenia: {exact_cost}, różnica: {cost - exact_cost}"
+                      f" ({100 * (cost - exact_cost) / max(exact_cost, 1):.2f}%)")
+        else:
+            min_weight_matching = nx.algorithms.matching.min_weight_matching(G_prime)            
 
         plt.figure(figsize=(10, 8))
         pos = nx.spring_layout(G_prime)
@@ -175,10 +258,10 @@ def chinese_postman_problem(graph):
             matching_text += f"Wierzchołki {u} i {v} (waga: {G_prime[u][v]['weight']})\n"
 
         shortest_paths_text = "Najkrótsze ścieżki między wszystkimi parami wierzchołków w G':\n"
-        for u, v in combinations(G_prime.nodes, 2):
-            shortest_path = nx.shortest_path(graph, source=u, target=v, weight='weight')
+        for u, v in G_prime.edges():
+            shortest_path = paths.path(u, v)
             path_str =  " ⟶ ".join(map(str, shortest_path))
-            shortest_path_weight = nx.shortest_path_length(graph, source=u, target=v, weight='weight')
+            shortest_path_weight = G_prime[u][v]['weight']
             shortest_paths_text += f"Wierzchołki {u} i {v}. Ścieżka: {path_str} (długość: {shortest_path_weight})\n"
 
         message = f"{matching_text}\n{shortest_paths_text}"
@@ -198,13 +281,21 @@ def chinese_postman_problem(graph):
         print("Minimalne skojarzenie:", min_weight_matching)
 
         for u, v in min_weight_matching:
-            shortest_path = nx.shortest_path(graph, source=u, target=v, weight='weight')
-            shortest_path_weight = nx.shortest_path_length(graph, source=u, target=v, weight='weight')
+            shortest_path = paths.path(u, v)
+            shortest_path_weight = G_prime[u][v]['weight']
             
-            graph.add_edge(u, v, weight=shortest_path_weight)
+            graph.add_edge(u, v, weight=shortest_path_weight, path=shortest_path)
             
             print(f"Dodano krawędź między {u} a {v} o wadze {shortest_path_weight}, odpowiadającą najkrótszej ścieżce {shortest_path}")
 
+        if tour_file:
+            if nx.is_eulerian(graph):
+                print("Nowo utworzony graf jest eulerowski.")
+                save_tour(graph, tour_file)
+            else:
+                print("Błąd: Graf nadal nie jest eulerowski po dodaniu krawędzi.")
+            return
+
         try:
             eulerian_circuit = list(nx.eulerian_circuit(graph))
             path_text = " ⟶ ".join(str(u) for u, v in eulerian_circuit) + " ⟶ " + str(eulerian_circuit[0][0])
@@ -249,6 +340,13 @@ def chinese_postman_problem(graph):
 
 
 def main():
+    # python main.py --workers N -> odległości między wierzchołkami nieparzystymi liczone równolegle w N procesach
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    # python main.py --neighbours R -> G' zawiera tylko R najbliższych wierzchołków nieparzystych każdego wierzchołka
+    neighbours = int(sys.argv[sys.argv.index("--neighbours") + 1]) if "--neighbours" in sys.argv else None
+    # python main.py --tour plik -> trasa zapisywana do pliku krawędź po krawędzi (u, v, waga) wraz z kosztem całkowitym
+    tour_file = sys.argv[sys.argv.index("--tour") + 1] if "--tour" in sys.argv else None
+
     def load_edges_from_file(file_path):
         edges = []
         with open(file_path, 'r') as file:
@@ -263,29 +361,71 @@ def main():
         G.add_weighted_edges_from(edges)
         return G
 
+    # output of options 1-3 cached by the SHA-256 of the input file (and the options that affect the result);
+    # runs with --tour are not cached, because writing the tour file is part of their result
+    solutions = {}
+    last_file = None
+    solver = None
+
+    def solve_file(file_path):
+        if tour_file:
+            chinese_postman_problem(build_graph_from_file(file_path), workers, neighbours, tour_file)
+            return
+        key = (file_hash(file_path), neighbours)
+        if key in solutions:
+            print(f"Plik {file_path} nie zmienił się - wynik z pamięci podręcznej:")
+            print(solutions[key], end='')
+            return
+        G = build_graph_from_file(file_path)
+        recorder = OutputRecorder(sys.stdout)
+        with redirect_stdout(recorder):
+            chinese_postman_problem(G, workers, neighbours)
+        solutions[key] = recorder.buffer.getvalue()
+
+    def edit_edge(solver):
+        try:
+            values = input("Podaj krawędź i nową wagę (u, v, waga; brak wagi usuwa krawędź): ").split(',')
+            u, v = int(values[0]), int(values[1])
+            weight = int(values[2]) if len(values) > 2 and values[2].strip() else None
+            recomputed, rematched = solver.update_edge(u, v, weight)
+        except (ValueError, IndexError) as error:
+            print(f"Niepoprawna zmiana: {error}")
+            return
+        print(f"Przeliczono drzew najkrótszych ścieżek: {recomputed}, ponownie kojarzonych wierzchołków: {rematched}")
+        if solver.graph.number_of_nodes() and not nx.is_connected(solver.graph):
+            print("Uwaga: graf nie jest spójny - trasa obejmuje tylko jedną jego składową.")
+        print(f"Wierzchołki nieparzystego stopnia: {sorted(solver.odd)}")
+        print(f"Skojarzenie: {[tuple(pair) for pair in solver.matching]}, koszt całkowity trasy: {solver.cost()}")
+        if tour_file:
+            edge_count, total_cost = solver.write_tour(tour_file)
+            print(f"Trasę listonosza ({edge_count} krawędzi, koszt całkowity: {total_cost}) zapisano do pliku {tour_file}")
+        else:
+            print(f"Trasa listonosza: {solver.route_text()}")
+
     while True:
         print("Mamy następujące opcje: ")
         print("1 -> wczytanie krawędzi grafu z pliku krawedzie1.txt - pozwala przetestować przypadek 1.")
         print("2 -> wczytanie krawędzi grafu z pliku krawedzie2.txt - pozwala przetestować przypadek 2.")
         print("3 -> wczytanie krawędzi grafu z pliku krawedzie3.txt - pozwala przetestować przypadek 3.")
         print("4 -> zakończenie działania programu")
-        user_input = input("Wybierz opcję (1, 2, 3, 4): ")
-
-        if user_input == '1':
-            file_path = 'krawedzie1.txt'
-            G = build_graph_from_file(file_path)
-            chinese_postman_problem(G)
-        elif user_input == '2':
-            file_path = 'krawedzie2.txt'
-            G = build_graph_from_file(file_path)
-            chinese_postman_problem(G)
-        elif user_input == '3':
-            file_path = 'krawedzie3.txt'
-            G = build_graph_from_file(file_path)
-            chinese_postman_problem(G)
+        print("5 -> zmiana krawędzi ostatnio wczytanego grafu i przyrostowe wyznaczenie nowej trasy")
+        user_input = input("Wybierz opcję (1, 2, 3, 4, 5): ")
+
+        if user_input in ('1', '2', '3'):
+            file_path = f'krawedzie{user_input}.txt'
+            solve_file(file_path)
+            if file_path != last_file:
+                last_file, solver = file_path, None
         elif user_input == '4':
             print("Koniec działania programu.")
             break
+        elif user_input == '5':
+            if last_file is None:
+                print("Najpierw wczytaj graf (opcje 1-3).")
+                continue
+            if solver is None:
+                solver = PostmanSolver(build_graph_from_file(last_file))
+            edit_edge(solver)
         else:
             print("Niepoprawna opcja. Proszę podać jeszcze raz.")
 
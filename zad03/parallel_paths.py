@@ -0,0 +1,146 @@
+"""
+Równoległe wyznaczanie najkrótszych ścieżek z wierzchołków nieparzystego stopnia.
+
+Graf jest raz zamieniany na tablice CSR (indptr, indices, weights) umieszczone w pamięci współdzielonej,
+więc procesy robocze nie dostają kopii obiektu networkx - dołączają się do tych samych bloków pamięci.
+Źródła są dzielone na paczki rozdzielane między procesy; każdy proces zapisuje odległości
+do wszystkich wierzchołków nieparzystych (wiersz macierzy k x k) oraz tablicę poprzedników
+(potrzebną do odtworzenia ścieżek) bezpośrednio do współdzielonych tablic wynikowych.
+Procesy czytają CSR przez memoryview na współdzielonym buforze, bez kopiowania go do własnej pamięci,
+a proces główny odczytuje ścieżki z bloku poprzedników przez widok, również bez kopii.
+"""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+worker_descriptions = {}
+
+
+def freeze_graph(graph):
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+
+    rows, cols, weights = [], [], []
+    for u, v, w in graph.edges(data='weight', default=1):
+        rows += [index[u], index[v]]
+        cols += [index[v], index[u]]
+        weights += [w, w]
+    rows = np.array(rows, dtype=np.int64)
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return nodes, index, indptr, np.array(cols, dtype=np.int64)[order], np.array(weights, dtype=np.float64)[order]
+
+
+def create_shared(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def shared_view(block, description):
+    # flat memoryview over the shared block: indexed one element at a time as fast as a list, without copying
+    _, shape, dtype = description
+    dtype = np.dtype(dtype)
+    return block.buf[:int(np.prod(shape)) * dtype.itemsize].cast(dtype.char)
+
+
+def init_worker(descriptions):
+    worker_descriptions.update(descriptions)
+
+
+def dijkstra_csr(indptr, indices, weights, source, n):
+    distances = [float('inf')] * n
+    predecessors = [-1] * n
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > distances[u]:
+            continue
+        for position in range(indptr[u], indptr[u + 1]):
+            v = indices[position]
+            candidate = d + weights[position]
+            if candidate < distances[v]:
+                distances[v] = candidate
+                predecessors[v] = u
+                heapq.heappush(heap, (candidate, v))
+    return distances, predecessors
+
+
+def run_batch(batch):
+    # the blocks are attached only for the duration of the batch, so every handle is closed again
+    blocks = {key: shared_memory.SharedMemory(name=description[0]) for key, description in worker_descriptions.items()}
+    views = {key: shared_view(blocks[key], worker_descriptions[key]) for key in ('indptr', 'indices', 'weights')}
+    sources = np.ndarray(worker_descriptions['sources'][1], dtype=worker_descriptions['sources'][2], buffer=blocks['sources'].buf)
+    matrix = np.ndarray(worker_descriptions['matrix'][1], dtype=worker_descriptions['matrix'][2], buffer=blocks['matrix'].buf)
+    predecessors = np.ndarray(worker_descriptions['predecessors'][1], dtype=worker_descriptions['predecessors'][2], buffer=blocks['predecessors'].buf)
+    try:
+        n = len(views['indptr']) - 1
+        for row in batch:
+            distances, tree = dijkstra_csr(views['indptr'], views['indices'], views['weights'], int(sources[row]), n)
+            matrix[row] = np.array(distances)[sources]
+            predecessors[row] = tree
+    finally:
+        # exported buffers have to be released before the blocks can be closed
+        del sources, matrix, predecessors
+        for view in views.values():
+            view.release()
+        for block in blocks.values():
+            block.close()
+
+
+class ParallelShortestPaths:
+    def __init__(self, graph, sources, workers=None, batch_size=None):
+        self.predecessor_block = None
+        self.nodes, self.index, indptr, indices, weights = freeze_graph(graph)
+        self.row = {source: i for i, source in enumerate(sources)}
+        source_indices = np.array([self.index[source] for source in sources], dtype=np.int64)
+        k, n = len(sources), len(self.nodes)
+
+        workers = workers or os.cpu_count() or 1
+        batch_size = batch_size or max(1, k // (4 * workers))
+        batches = [range(start, min(start + batch_size, k)) for start in range(0, k, batch_size)]
+
+        blocks, descriptions = [], {}
+        for key, array in (('indptr', indptr), ('indices', indices), ('weights', weights), ('sources', source_indices),
+                           ('matrix', np.zeros((k, k), dtype=np.float64)), ('predecessors', np.zeros((k, n), dtype=np.int64))):
+            block, descriptions[key] = create_shared(array)
+            blocks.append(block)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(descriptions,)) as executor:
+                list(executor.map(run_batch, batches))
+            self.matrix = np.ndarray((k, k), dtype=np.float64, buffer=blocks[4].buf).copy()
+        finally:
+            for block in blocks:
+                block.unlink()
+            for block in blocks[:5]:
+                block.close()
+        # the k x n predecessor block stays mapped (its name is already unlinked) and is read through a view
+        self.predecessor_block = blocks[5]
+        self.predecessors = np.ndarray((k, n), dtype=np.int64, buffer=self.predecessor_block.buf)
+
+    def close(self):
+        if self.predecessor_block is not None:
+            del self.predecessors
+            self.predecessor_block.close()
+            self.predecessor_block = None
+
+    def __del__(self):
+        self.close()
+
+    def distance(self, source, target):
+        d = self.matrix[self.row[source], self.row[target]]
+        return None if np.isinf(d) else (int(d) if d.is_integer() else float(d))
+
+    def path(self, source, target):
+        tree = self.predecessors[self.row[source]]
+        start = self.index[source]
+        path = [self.index[target]]
+        while path[-1] != start:
+            path.append(int(tree[path[-1]]))
+        return [self.nodes[i] for i in reversed(path)]
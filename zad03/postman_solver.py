@@ -0,0 +1,181 @@
+"""
+Przyrostowe rozwiązywanie problemu chińskiego listonosza po zmianach w grafie.
+
+PostmanSolver przechowuje graf, zbiór wierzchołków nieparzystego stopnia, drzewa najkrótszych ścieżek
+z każdego z nich oraz bieżące skojarzenie. Po zmianie krawędzi (zmiana wagi, dodanie, usunięcie):
+- ponownie liczone są tylko drzewa, na które zmiana wpływa: przy wzroście wagi lub usunięciu krawędzi
+  te, w których krawędź leżała na najkrótszej ścieżce, a przy spadku wagi lub dodaniu krawędzi te,
+  w których krawędź skraca odległość do któregoś z jej końców,
+- z dotychczasowego skojarzenia usuwane są pary, których odległość wzrosła lub których wierzchołek
+  przestał być nieparzysty; zwolnione (i nowe nieparzyste) wierzchołki są kojarzone ponownie między sobą,
+  a nowe pary i pary o przeliczonych odległościach poprawiane są zamianami 2-opt z pozostałymi parami.
+Naprawa jest lokalna, więc skojarzenie może być nieco droższe od optymalnego; rematch() kojarzy od nowa
+wszystkie wierzchołki nieparzyste, korzystając z zapamiętanych drzew (bez ponownego liczenia Dijkstry).
+"""
+
+from itertools import combinations
+import networkx as nx
+from postman_tour import eulerian_tour, write_tour
+
+
+class PostmanSolver:
+    def __init__(self, graph):
+        self.graph = graph
+        self.odd = {node for node in graph.nodes if graph.degree[node] % 2 != 0}
+        self.trees = {node: self.tree(node) for node in self.odd}
+        self.matching = {}
+        self.match(self.odd)
+
+    def tree(self, source):
+        return nx.dijkstra_predecessor_and_distance(self.graph, source, weight='weight')
+
+    def distance(self, source, target):
+        return self.trees[source][1].get(target)
+
+    def path(self, source, target):
+        predecessors, _ = self.trees[source]
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]][0])
+        return path[::-1]
+
+    def match(self, vertices):
+        G_prime = nx.Graph()
+        for u, v in combinations(vertices, 2):
+            distance = self.distance(u, v)
+            if distance is not None:
+                G_prime.add_edge(u, v, weight=distance)
+        pairs = [frozenset(edge) for edge in nx.algorithms.matching.min_weight_matching(G_prime)]
+        for pair in pairs:
+            u, v = tuple(pair)
+            self.matching[pair] = G_prime[u][v]['weight']
+        return pairs
+
+    def improve(self, pairs):
+        # 2-opt: a pair from `pairs` and any other pair swap partners whenever that lowers the matching cost
+        queue = list(pairs)
+        while queue:
+            pair = queue.pop()
+            if pair not in self.matching:
+                continue
+            a, b = tuple(pair)
+            for other, other_distance in list(self.matching.items()):
+                if other == pair:
+                    continue
+                c, d = tuple(other)
+                current = self.matching[pair] + other_distance
+                best = None
+                for x, y, z, w in ((a, c, b, d), (a, d, b, c)):
+                    first, second = self.distance(x, y), self.distance(z, w)
+                    if first is not None and second is not None and first + second < current:
+                        best, current = (x, y, first, z, w, second), first + second
+                if best is not None:
+                    x, y, first, z, w, second = best
+                    del self.matching[pair], self.matching[other]
+                    self.matching[frozenset((x, y))] = first
+                    self.matching[frozenset((z, w))] = second
+                    queue += [frozenset((x, y)), frozenset((z, w))]
+                    break
+
+    def edge_weight(self, u, v):
+        if not self.graph.has_edge(u, v):
+            return None
+        return min(data.get('weight', 1) for data in self.graph[u][v].values())
+
+    def affected(self, source, u, v, old, new):
+        distances = self.trees[source][1]
+        du, dv = distances.get(u), distances.get(v)
+        if old is not None and (new is None or new > old):
+            if du is not None and dv is not None and (du + old == dv or dv + old == du):
+                return True
+        if new is not None and (old is None or new < old):
+            if du is not None and (dv is None or du + new < dv):
+                return True
+            if dv is not None and (du is None or dv + new < du):
+                return True
+        return False
+
+    def update_edge(self, u, v, weight=None):
+        # weight=None removes one u-v edge; otherwise the weight of the first u-v edge is changed, or a new edge is added if there is none
+        old = self.edge_weight(u, v)
+        if weight is None:
+            if old is None:
+                raise ValueError(f"Krawędź {u} - {v} nie istnieje.")
+            self.graph.remove_edge(u, v)
+            parity_changed = True
+        elif old is None:
+            self.graph.add_edge(u, v, weight=weight)
+            parity_changed = True
+        else:
+            key = next(iter(self.graph[u][v]))
+            self.graph[u][v][key]['weight'] = weight
+            parity_changed = False
+        new = self.edge_weight(u, v)
+
+        recompute = {source for source in self.trees if self.affected(source, u, v, old, new)}
+        free = set()
+        if parity_changed and u != v:
+            for node in (u, v):
+                if node in self.odd:
+                    self.odd.discard(node)
+                    del self.trees[node]
+                    recompute.discard(node)
+                else:
+                    self.odd.add(node)
+                    recompute.add(node)
+                    free.add(node)
+
+        for source in recompute:
+            self.trees[source] = self.tree(source)
+
+        # distances change only between vertices whose trees were recomputed; pairs that got longer are released,
+        # the remaining pairs of those vertices (shorter distances) are only improved by 2-opt swaps
+        # (a missing distance, e.g. after removing a bridge, also releases the pair; its vertices are matched within their components)
+        touched = []
+        for pair, distance in list(self.matching.items()):
+            a, b = tuple(pair)
+            if a not in self.odd or b not in self.odd:
+                current = None
+            elif a in recompute or b in recompute:
+                current = self.distance(a, b) if a in recompute else self.distance(b, a)
+            else:
+                continue
+            if current is None or current > distance:
+                del self.matching[pair]
+                free.update(node for node in pair if node in self.odd)
+            else:
+                self.matching[pair] = current
+                touched.append(pair)
+
+        self.improve(self.match(free) + touched)
+        return len(recompute), len(free)
+
+    def rematch(self):
+        self.matching = {}
+        self.match(self.odd)
+
+    def cost(self):
+        return sum(weight for _, _, weight in self.graph.edges(data='weight', default=1)) + sum(self.matching.values())
+
+    def with_matching_edges(self, action):
+        keys = []
+        for pair, distance in self.matching.items():
+            a, b = tuple(pair)
+            keys.append((a, b, self.graph.add_edge(a, b, weight=distance, path=self.path(a, b))))
+        try:
+            return action()
+        finally:
+            for a, b, key in keys:
+                self.graph.remove_edge(a, b, key)
+
+    def route_text(self):
+        def text():
+            tour = eulerian_tour(self.graph)
+            first = next(tour, None)
+            if first is None:
+                return ""
+            return " ⟶ ".join([str(first[0]), str(first[1])] + [str(v) for _, v, _ in tour])
+        return self.with_matching_edges(text)
+
+    def write_tour(self, filename):
+        return self.with_matching_edges(lambda: write_tour(self.graph, filename))
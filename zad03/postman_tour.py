@@ -0,0 +1,78 @@
+"""
+Strumieniowe wypisywanie trasy listonosza.
+
+Cykl Eulera wyznaczany jest iteracyjnym algorytmem Hierholzera: krawędzie są zwracane w momencie
+zdejmowania ich ze stosu, więc trasa nie jest nigdzie budowana w całości (w grafie nieskierowanym
+odwrócony cykl też jest poprawną trasą). Krawędzie dodane w przypadku 3 (atrybut 'path') są rozwijane
+z powrotem w rzeczywiste krawędzie najkrótszej ścieżki, dzięki czemu trasę da się przejechać.
+Trasa zapisywana jest do pliku paczkami linii "u, v, waga", a na końcu dopisywany jest koszt całkowity.
+"""
+
+CHUNK_SIZE = 10000
+
+
+def real_weight(graph, u, v):
+    return min(data.get('weight', 1) for data in graph[u][v].values() if 'path' not in data)
+
+
+def eulerian_tour(graph, start=None):
+    endpoints, weights, paths = [], [], []
+    adjacency = {node: [] for node in graph.nodes}
+    for u, v, data in graph.edges(data=True):
+        adjacency[u].append(len(endpoints))
+        if u != v:
+            adjacency[v].append(len(endpoints))
+        endpoints.append((u, v))
+        weights.append(data.get('weight', 1))
+        paths.append(data.get('path'))
+
+    if start is None:
+        start = next((node for node, edges in adjacency.items() if edges), None)
+        if start is None:
+            return
+    used = bytearray(len(endpoints))
+    position = dict.fromkeys(adjacency, 0)
+    stack = [(start, None)]
+    while stack:
+        node, edge_in = stack[-1]
+        edges = adjacency[node]
+        i = position[node]
+        while i < len(edges) and used[edges[i]]:
+            i += 1
+        position[node] = i
+        if i < len(edges):
+            edge = edges[i]
+            used[edge] = 1
+            u, v = endpoints[edge]
+            stack.append((v if u == node else u, edge))
+            continue
+
+        stack.pop()
+        if edge_in is None:
+            continue
+        previous = stack[-1][0]
+        path = paths[edge_in]
+        if path is None:
+            yield node, previous, weights[edge_in]
+        else:
+            if path[0] != node:
+                path = path[::-1]
+            for a, b in zip(path, path[1:]):
+                yield a, b, real_weight(graph, a, b)
+
+
+def write_tour(graph, filename, start=None, chunk_size=CHUNK_SIZE):
+    total_cost = 0
+    edge_count = 0
+    chunk = []
+    with open(filename, 'w') as file:
+        for u, v, w in eulerian_tour(graph, start):
+            chunk.append(f"{u}, {v}, {w}\n")
+            total_cost += w
+            edge_count += 1
+            if len(chunk) >= chunk_size:
+                file.write(''.join(chunk))
+                chunk.clear()
+        file.write(''.join(chunk))
+        file.write(f"# koszt całkowity: {total_cost}\n")
+    return edge_count, total_cost
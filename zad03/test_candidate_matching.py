@@ -0,0 +1,58 @@
+import random
+import networkx as nx
+import pytest
+from candidate_matching import CandidatePaths, candidate_graph, sparse_min_weight_matching
+
+
+def odd_vertices(G):
+    return [v for v in G if G.degree[v] % 2 != 0]
+
+
+@pytest.mark.parametrize('neighbours', [1, 2, 5])
+def test_candidates_are_the_nearest_odd_vertices(neighbours, random_multigraph):
+    G = random_multigraph(random.Random(neighbours), 150)
+    odd = odd_vertices(G)
+    paths = CandidatePaths(G, odd, neighbours)
+    for source, target, distance in paths.candidates:
+        expected = nx.single_source_dijkstra_path_length(G, source, weight='weight')
+        assert distance == expected[target]
+        # no odd vertex outside the candidates is strictly closer than the furthest candidate
+        found = [t for s, t, _ in paths.candidates if s == source]
+        furthest = max(expected[t] for t in found)
+        closer = [v for v in odd if v != source and expected[v] < furthest]
+        assert set(closer) <= set(found)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sparse_matching_is_perfect_with_valid_paths(seed, random_multigraph):
+    G = random_multigraph(random.Random(seed), 200)
+    odd = odd_vertices(G)
+    paths = CandidatePaths(G, odd, 1)
+    G_prime = candidate_graph(paths)
+    matching, repaired = sparse_min_weight_matching(G_prime, paths, odd)
+
+    matched = [v for edge in matching for v in edge]
+    assert sorted(matched) == sorted(odd)
+    assert set(repaired) <= matching
+    for u, v in matching:
+        path = paths.path(u, v)
+        assert path[0] == u and path[-1] == v
+        weight = sum(min(data['weight'] for data in G[a][b].values()) for a, b in zip(path, path[1:]))
+        assert weight == G_prime[u][v]['weight'] == nx.dijkstra_path_length(G, u, v)
+
+
+def test_greedy_repair_pairs_vertices_left_unmatched():
+    # in a star every leaf has only the centre as its nearest odd vertex, so the candidate graph is
+    # the star itself and two leaves have to be paired by the repair step
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 1), (0, 2, 1), (0, 3, 1)])
+    odd = odd_vertices(G)
+    paths = CandidatePaths(G, odd, 1)
+    G_prime = candidate_graph(paths)
+    matching, repaired = sparse_min_weight_matching(G_prime, paths, odd)
+    assert sorted(v for edge in matching for v in edge) == [0, 1, 2, 3]
+    assert len(repaired) == 1
+    u, v = repaired[0]
+    assert 0 not in (u, v)
+    assert G_prime[u][v]['weight'] == 2
+    assert paths.path(u, v) == [u, 0, v]
@@ -0,0 +1,35 @@
+import random
+import networkx as nx
+import pytest
+from parallel_paths import ParallelShortestPaths
+
+
+def path_weight(G, path):
+    return sum(min(data['weight'] for data in G[u][v].values()) for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('workers, batch_size', [(1, None), (3, None), (2, 1)])
+def test_distances_and_paths_match_single_process_dijkstra(workers, batch_size, random_multigraph):
+    G = random_multigraph(random.Random(workers), 120)
+    # an isolated vertex checks that unreachable pairs have no distance
+    G.add_node('isolated')
+    sources = [v for v in G if G.degree[v] % 2 != 0] + ['isolated']
+    paths = ParallelShortestPaths(G, sources, workers, batch_size)
+    for source in sources:
+        expected = nx.single_source_dijkstra_path_length(G, source, weight='weight')
+        for target in sources:
+            assert paths.distance(source, target) == expected.get(target)
+            if target in expected:
+                path = paths.path(source, target)
+                assert path[0] == source and path[-1] == target
+                assert path_weight(G, path) == expected[target]
+    paths.close()
+
+
+def test_float_weights():
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 0.5), (1, 2, 0.25), (0, 2, 1.0), (2, 3, 2.0)])
+    paths = ParallelShortestPaths(G, [0, 3], workers=2)
+    assert paths.distance(0, 3) == 2.75
+    assert paths.path(0, 3) == [0, 1, 2, 3]
+    paths.close()
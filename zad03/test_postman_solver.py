@@ -0,0 +1,100 @@
+import random
+from collections import Counter
+import networkx as nx
+import pytest
+from postman_solver import PostmanSolver
+from postman_tour import eulerian_tour
+
+
+def random_edit(solver, rng):
+    G = solver.graph
+    operation = rng.random()
+    if operation < 0.4:
+        u, v = rng.choice(list(G.edges()))
+        solver.update_edge(u, v, rng.randint(1, 12))
+    elif operation < 0.7:
+        u, v = rng.sample(list(G.nodes), 2)
+        solver.update_edge(u, v, rng.randint(1, 12))
+    else:
+        u, v = rng.choice(list(G.edges()))
+        solver.update_edge(u, v)
+
+
+def assert_consistent(solver):
+    fresh = PostmanSolver(solver.graph.copy())
+    assert solver.odd == fresh.odd
+    for source in solver.odd:
+        assert solver.trees[source][1] == fresh.trees[source][1]
+    for pair, distance in solver.matching.items():
+        a, b = tuple(pair)
+        assert distance is not None and distance == fresh.distance(a, b)
+    # every odd vertex is matched unless its component has no other odd vertex to pair with
+    matched = {v for pair in solver.matching for v in pair}
+    assert matched == {v for pair in fresh.matching for v in pair}
+    assert solver.cost() >= fresh.cost()
+    return fresh
+
+
+def assert_valid_tour(solver):
+    tour = solver.with_matching_edges(lambda: list(eulerian_tour(solver.graph)))
+    for (_, v, _), (u, _, _) in zip(tour, tour[1:]):
+        assert v == u
+    assert tour[-1][1] == tour[0][0]
+    used = Counter(frozenset((u, v)) for u, v, _ in tour)
+    assert all(used[frozenset(edge)] >= 1 for edge in solver.graph.edges())
+    assert sum(w for _, _, w in tour) == solver.cost()
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_update_edge_matches_fresh_solve(seed, random_multigraph):
+    rng = random.Random(seed)
+    n = rng.randint(4, 25)
+    solver = PostmanSolver(random_multigraph(rng, n, extra_edges=rng.randint(0, n)))
+    for _ in range(15):
+        before = solver.graph.copy()
+        random_edit(solver, rng)
+        if not nx.is_connected(solver.graph):
+            # the tour is only defined for connected graphs; undo edits that split the graph
+            solver = PostmanSolver(before)
+            continue
+        fresh = assert_consistent(solver)
+        assert_valid_tour(solver)
+        solver.rematch()
+        assert solver.cost() == fresh.cost()
+
+
+def test_removing_a_bridge_between_matched_vertices():
+    # 0 and 3 are the only odd vertices and are matched across the bridge 1-2;
+    # after removing it 1 and 2 become odd and the old pair has no path at all
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 1), (1, 2, 5), (2, 3, 1)])
+    solver = PostmanSolver(G)
+    assert set(solver.matching) == {frozenset((0, 3))}
+
+    solver.update_edge(1, 2)
+    assert solver.odd == {0, 1, 2, 3}
+    assert solver.matching == {frozenset((0, 1)): 1, frozenset((2, 3)): 1}
+    assert solver.cost() == 4
+    assert_consistent(solver)
+
+
+def test_bridge_removal_with_pairs_kept_in_their_components(random_multigraph):
+    rng = random.Random(7)
+    for _ in range(20):
+        G = random_multigraph(rng, 30, extra_edges=rng.randint(0, 30))
+        solver = PostmanSolver(G)
+        bridges = list(nx.bridges(nx.Graph(G)))
+        bridges = [(u, v) for u, v in bridges if G.number_of_edges(u, v) == 1]
+        if not bridges:
+            continue
+        solver.update_edge(*rng.choice(bridges))
+        assert_consistent(solver)
+        solver.cost()
+
+
+def test_update_edge_rejects_removing_a_missing_edge():
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 1), (1, 2, 1)])
+    solver = PostmanSolver(G)
+    with pytest.raises(ValueError):
+        solver.update_edge(0, 2)
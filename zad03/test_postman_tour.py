@@ -0,0 +1,59 @@
+import random
+from collections import Counter
+import networkx as nx
+from postman_tour import eulerian_tour, write_tour
+
+
+def assert_closed_walk(tour):
+    for (_, v, _), (u, _, _) in zip(tour, tour[1:]):
+        assert v == u
+    assert tour[-1][1] == tour[0][0]
+
+
+def test_tour_uses_every_edge_once(random_multigraph):
+    for seed in range(20):
+        G = random_multigraph(random.Random(seed), 60, extra_edges=0, eulerian=True)
+        tour = list(eulerian_tour(G))
+        assert_closed_walk(tour)
+        assert Counter(frozenset((u, v)) for u, v, _ in tour) == Counter(frozenset((u, v)) for u, v in G.edges())
+        assert sum(w for _, _, w in tour) == G.size(weight='weight')
+
+
+def test_start_vertex_and_self_loops():
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 2), (1, 2, 3), (2, 0, 4), (1, 1, 5)])
+    tour = list(eulerian_tour(G, start=2))
+    assert_closed_walk(tour)
+    assert tour[0][0] == 2
+    assert sorted(w for _, _, w in tour) == [2, 3, 4, 5]
+
+
+def test_synthetic_edges_are_expanded_into_real_edges():
+    # 0 and 1 are odd; the augmenting edge 0-1 stands for the shortest path 0-2-1,
+    # whose 2-1 step has to use the cheaper of the two parallel edges (2, not 7)
+    G = nx.MultiGraph()
+    G.add_weighted_edges_from([(0, 1, 20), (1, 2, 7), (1, 2, 2), (2, 3, 1), (3, 0, 10), (0, 2, 8)])
+    G.add_edge(0, 1, weight=10, path=[0, 2, 1])
+    tour = list(eulerian_tour(G))
+    assert_closed_walk(tour)
+    real_edges = {frozenset((u, v)) for u, v, data in G.edges(data=True) if 'path' not in data}
+    assert all(frozenset((u, v)) in real_edges for u, v, _ in tour)
+    assert len(tour) == 6 + 2
+    assert sum(w for _, _, w in tour) == 20 + 7 + 2 + 1 + 10 + 8 + 10
+    assert Counter(w for _, _, w in tour)[2] == 2
+
+
+def test_write_tour_streams_lines_and_cost(tmp_path, random_multigraph):
+    G = random_multigraph(random.Random(5), 40, extra_edges=0, eulerian=True)
+    filename = tmp_path / "trasa.txt"
+    edge_count, total_cost = write_tour(G, filename, chunk_size=3)
+    lines = filename.read_text().splitlines()
+    assert lines[-1] == f"# koszt całkowity: {total_cost}"
+    assert edge_count == len(lines) - 1 == G.number_of_edges()
+    tour = [tuple(int(x) for x in line.split(', ')) for line in lines[:-1]]
+    assert tour == list(eulerian_tour(G))
+    assert total_cost == G.size(weight='weight')
+
+
+def test_empty_graph():
+    assert list(eulerian_tour(nx.MultiGraph())) == []